@@ -1,115 +1,275 @@
 #simple calculator by kevin kennell
 from tkinter import *
+from tkinter import filedialog
+from decimal import InvalidOperation
 
-root = Tk()
-
-root.configure(bg='black')
-root.title("Simple Calculator By Kevin")
-d = Entry(root, width=35, borderwidth=30, bg='grey')
-d.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
-e = Entry(root, width=35, borderwidth=0, bg='green')
-e.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
-math = 0
-e.insert(0, "")
-
-def button_click(number):
-    #e.delete(0, END)
-    current = e.get()
-    e.delete(0, END)
-    e.insert(0, str(current) + str(number))
-
-def button_clear():
-    e.delete(0, END)
-
-def button_add():
-    first_number = e.get()
-    global f_num
-    global math
-    math = "addition"
-    f_num = int(first_number)
-    e.delete(0, END)
-
-def button_equal():
-    second_number = e.get()
-    e.delete(0, END)
-
-    if math == "addition":
-        e.insert(0, f_num + int(second_number))
-
-    if math == "subtraction":
-        e.insert(0, f_num - int(second_number))
-
-    if math == "multiplication":
-        e.insert(0, f_num * int(second_number))
-
-    if math == "division":
-        e.insert(0, f_num / int(second_number))
-def button_subtract():
-    first_number = e.get()
-    global f_num
-    global math
-    math = "subtraction"
-    f_num = int(first_number)
-    e.delete(0, END)
-
-def button_multiply():
-    first_number = e.get()
-    global f_num
-    global math
-    math = "multiplication"
-    f_num = int(first_number)
-    e.delete(0, END)
-
-def button_divide():
-    first_number = e.get()
-    global f_num
-    global math
-    math = "division"
-    f_num = int(first_number)
-    e.delete(0, END)
-
-
-# Define Buttons
-
-button_1 = Button(root, text="1", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(1))
-button_2 = Button(root, text="2", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(2))
-button_3 = Button(root, text="3", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(3))
-button_4 = Button(root, text="4", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(4))
-button_5 = Button(root, text="5", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(5))
-button_6 = Button(root, text="6", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(6))
-button_7 = Button(root, text="7", fg='white',bg='black', padx=41, pady=20, command=lambda: button_click(7))
-button_8 = Button(root, text="8", fg='white',bg='black', padx=41, pady=20, command=lambda: button_click(8))
-button_9 = Button(root, text="9", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(9))
-button_0 = Button(root, text="0", fg='white',bg='black',padx=41, pady=20, command=lambda: button_click(0))
-
-button_add = Button(root, text="+", fg='white',bg='black',padx=40, pady=20, command=button_add)
-button_equal = Button(root, text="=", fg='white',bg='black',padx=89, pady=20, command=button_equal)
-button_clear = Button(root, text="C", fg='white',bg='black',padx=89, pady=20, command=button_clear)
-button_subtract = Button(root, text="-", fg='white',bg='black',padx=42, pady=20, command=button_subtract)
-button_multiply = Button(root, text="*", fg='white',bg='black', padx=42, pady=20, command=button_multiply)
-button_divide = Button(root, text="/", fg='white',bg='black',padx=41, pady=20, command=button_divide)
-
-# Put the buttons on the screen
-
-button_1.grid(row=3, column=0)
-button_2.grid(row=3, column=1)
-button_3.grid(row=3, column=2)
-
-button_4.grid(row=2, column=0)
-button_5.grid(row=2, column=1)
-button_6.grid(row=2, column=2)
-
-button_7.grid(row=1, column=0)
-button_8.grid(row=1, column=1)
-button_9.grid(row=1, column=2)
-
-button_0.grid(row=4, column=0)
-button_clear.grid(row=4, column=1, columnspan=2)
-button_add.grid(row=5, column=0)
-button_equal.grid(row=5, column=1, columnspan=2)
-
-button_subtract.grid(row=6, column=0)
-button_multiply.grid(row=6, column=1)
-button_divide.grid(row=6, column=2)
-
-root.mainloop()
+from calc_engine import (MODES, DEFAULT_PRECISION, MAX_PRECISION, parse_number, apply_operation, factorial,
+                         evaluate_expression, format_result)
+from calc_worker import BackgroundEvaluation
+from calc_columns import parse_binding, evaluate_columns_to_file
+import tk_profiler
+
+POLL_INTERVAL = 50  # ms
+
+
+class Calculator:
+    def __init__(self, root):
+        self.root = root
+        self.window = root.winfo_toplevel()
+
+        self.root.configure(bg='black')
+        self.window.title("Simple Calculator By Kevin")
+        self.d = Entry(self.root, width=35, borderwidth=30, bg='grey')
+        self.d.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
+        self.e = Entry(self.root, width=35, borderwidth=0, bg='green')
+        self.e.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
+        self.math = 0
+        self.f_num = None
+        self.e.insert(0, "")
+
+        self.mode = StringVar(self.root, value="float")
+        self.precision = IntVar(self.root, value=DEFAULT_PRECISION)
+
+        # The exact value behind the last result, since huge results are only shown rounded
+        self.last_result = None
+        self.last_text = ""
+        self.last_mode = None
+
+        # The computation currently running in the background, if any
+        self.evaluation = None
+        self.result_handler = None
+        self.poll_id = None
+
+        self.create_buttons()
+
+    def create_buttons(self):
+        root = self.root
+
+        # Define Buttons
+
+        button_1 = Button(root, text="1", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(1))
+        button_2 = Button(root, text="2", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(2))
+        button_3 = Button(root, text="3", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(3))
+        button_4 = Button(root, text="4", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(4))
+        button_5 = Button(root, text="5", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(5))
+        button_6 = Button(root, text="6", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(6))
+        button_7 = Button(root, text="7", fg='white',bg='black', padx=41, pady=20, command=lambda: self.button_click(7))
+        button_8 = Button(root, text="8", fg='white',bg='black', padx=41, pady=20, command=lambda: self.button_click(8))
+        button_9 = Button(root, text="9", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(9))
+        button_0 = Button(root, text="0", fg='white',bg='black',padx=41, pady=20, command=lambda: self.button_click(0))
+        button_point = Button(root, text=".", fg='white',bg='black',padx=43, pady=20, command=lambda: self.button_click("."))
+
+        button_add = Button(root, text="+", fg='white',bg='black',padx=40, pady=20, command=self.button_add)
+        button_equal = Button(root, text="=", fg='white',bg='black',padx=89, pady=20, command=self.button_equal)
+        button_clear = Button(root, text="C", fg='white',bg='black',padx=89, pady=20, command=self.button_clear)
+        button_subtract = Button(root, text="-", fg='white',bg='black',padx=42, pady=20, command=self.button_subtract)
+        button_multiply = Button(root, text="*", fg='white',bg='black', padx=42, pady=20, command=self.button_multiply)
+        button_divide = Button(root, text="/", fg='white',bg='black',padx=41, pady=20, command=self.button_divide)
+
+        # Number mode and Decimal precision
+
+        mode_menu = OptionMenu(root, self.mode, *MODES)
+        mode_menu.config(fg='white', bg='black', highlightthickness=0)
+        button_power = Button(root, text="^", fg='white',bg='black',padx=42, pady=20, command=self.button_power)
+        button_factorial = Button(root, text="n!", fg='white',bg='black',padx=38, pady=20, command=self.button_factorial)
+        button_columns = Button(root, text="Columns...", fg='white',bg='black',padx=70, pady=20, command=self.column_mode)
+        self.button_cancel = Button(root, text="Cancel", fg='white',bg='black',padx=22, pady=20, state=DISABLED, command=self.cancel)
+
+        precision_box = Spinbox(root, from_=1, to=MAX_PRECISION, textvariable=self.precision, width=6, fg='white', bg='black')
+
+        # Put the buttons on the screen
+
+        button_1.grid(row=3, column=0)
+        button_2.grid(row=3, column=1)
+        button_3.grid(row=3, column=2)
+
+        button_4.grid(row=2, column=0)
+        button_5.grid(row=2, column=1)
+        button_6.grid(row=2, column=2)
+
+        button_7.grid(row=1, column=0)
+        button_8.grid(row=1, column=1)
+        button_9.grid(row=1, column=2)
+
+        button_0.grid(row=4, column=0)
+        button_clear.grid(row=4, column=1, columnspan=2)
+        button_add.grid(row=5, column=0)
+        button_equal.grid(row=5, column=1, columnspan=2)
+
+        button_subtract.grid(row=6, column=0)
+        button_multiply.grid(row=6, column=1)
+        button_divide.grid(row=6, column=2)
+
+        button_point.grid(row=7, column=0)
+        mode_menu.grid(row=7, column=1, sticky="nsew")
+        precision_box.grid(row=7, column=2)
+
+        button_power.grid(row=8, column=0)
+        button_factorial.grid(row=8, column=1)
+        self.button_cancel.grid(row=8, column=2)
+
+        button_columns.grid(row=9, column=0, columnspan=3)
+
+    def get_precision(self):
+        try:
+            return min(max(self.precision.get(), 1), MAX_PRECISION)
+        except TclError:
+            return DEFAULT_PRECISION
+
+    def read_entry(self):
+        text = self.e.get()
+        if self.last_result is not None and text == self.last_text and self.mode.get() == self.last_mode:
+            return self.last_result
+        return parse_number(text, self.mode.get(), self.get_precision())
+
+    def show_result(self, value):
+        self.last_result = value
+        self.last_text = format_result(value)
+        self.last_mode = self.mode.get()
+        self.e.delete(0, END)
+        self.e.insert(0, self.last_text)
+
+    def show_text(self, text):
+        self.e.delete(0, END)
+        self.e.insert(0, text)
+
+    def start_evaluation(self, func, *args, on_result=None, **budget):
+        """Run func(*args) in a worker process and show a busy state until it is done."""
+        self.evaluation = BackgroundEvaluation(func, args, **budget)
+        self.result_handler = on_result or self.show_result
+        self.show_text("Working...")
+        self.e.config(state=DISABLED)
+        self.button_cancel.config(state=NORMAL)
+        self.poll_id = self.root.after(POLL_INTERVAL, self.poll_evaluation)
+
+    def poll_evaluation(self):
+        self.poll_id = None
+        if self.evaluation is None:
+            return
+        if not self.evaluation.poll():
+            self.e.config(state=NORMAL)
+            self.show_text(f"Working... {self.evaluation.elapsed():.0f}s")
+            self.e.config(state=DISABLED)
+            self.poll_id = self.root.after(POLL_INTERVAL, self.poll_evaluation)
+            return
+        finished, self.evaluation = self.evaluation, None
+        self.e.config(state=NORMAL)
+        self.button_cancel.config(state=DISABLED)
+        if finished.error is None:
+            self.result_handler(finished.result)
+        else:
+            self.show_text(f"Error: {finished.error}")
+
+    def cancel(self):
+        if self.evaluation is not None:
+            self.evaluation.cancel()
+            if self.poll_id is not None:
+                self.root.after_cancel(self.poll_id)
+            self.poll_evaluation()
+
+    def close(self):
+        """Cancel a running evaluation along with its polling."""
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+        if self.evaluation is not None:
+            self.evaluation.cancel()
+            self.evaluation = None
+
+    def show_rows_written(self, rows):
+        self.show_text(f"{rows} rows written")
+
+    def column_mode(self):
+        """Window for applying one expression to whole columns loaded from files."""
+        window = Toplevel(self.root)
+        window.title("Column Mode")
+        window.configure(bg='black')
+
+        Label(window, text="Expression", fg='white', bg='black').grid(row=0, column=0, sticky="w", padx=10)
+        expression = Entry(window, width=40, bg='green')
+        expression.insert(0, "" if self.e.get() == self.last_text else self.e.get())
+        expression.grid(row=1, column=0, columnspan=2, padx=10, pady=5)
+
+        Label(window, text="Variables, one name=file or name=file.csv:column per line", fg='white', bg='black').grid(row=2, column=0, columnspan=2, sticky="w", padx=10)
+        variables = Text(window, width=40, height=5, bg='grey')
+        variables.grid(row=3, column=0, columnspan=2, padx=10, pady=5)
+
+        def add_file():
+            path = filedialog.askopenfilename(parent=window, filetypes=[("Data", "*.csv *.txt"), ("All files", "*")])
+            if path:
+                variables.insert(END, f"x{int(variables.index('end-1c').split('.')[0])}={path}\n")
+
+        def run():
+            if self.evaluation is not None:
+                return
+            output = filedialog.asksaveasfilename(parent=window, defaultextension=".txt")
+            if not output:
+                return
+            try:
+                bindings = [parse_binding(line) for line in variables.get("1.0", END).splitlines() if line.strip()]
+            except ValueError as error:
+                self.show_text(f"Error: {error}")
+                return
+            window.destroy()
+            # whole files can legitimately take a while, Cancel is still there
+            self.start_evaluation(evaluate_columns_to_file, expression.get(), bindings, output,
+                                  on_result=self.show_rows_written, timeout=None, cpu_limit=None, memory_limit=None)
+
+        Button(window, text="Add File...", fg='white', bg='black', command=add_file).grid(row=4, column=0, pady=10)
+        Button(window, text="Run", fg='white', bg='black', command=run).grid(row=4, column=1, pady=10)
+
+    def button_click(self, number):
+        #e.delete(0, END)
+        current = self.e.get()
+        self.e.delete(0, END)
+        self.e.insert(0, str(current) + str(number))
+
+    def button_clear(self):
+        self.e.delete(0, END)
+
+    def start_operation(self, operation):
+        self.math = operation
+        self.f_num = self.read_entry()
+        self.e.delete(0, END)
+
+    def button_add(self):
+        self.start_operation("addition")
+
+    def button_subtract(self):
+        self.start_operation("subtraction")
+
+    def button_multiply(self):
+        self.start_operation("multiplication")
+
+    def button_divide(self):
+        self.start_operation("division")
+
+    def button_power(self):
+        self.start_operation("power")
+
+    def button_equal(self):
+        if self.evaluation is not None:
+            return
+        try:
+            if self.math:
+                operation, self.math = self.math, 0
+                self.start_evaluation(apply_operation, operation, self.f_num, self.read_entry(), self.get_precision())
+            elif self.e.get() != self.last_text:
+                self.start_evaluation(evaluate_expression, self.e.get(), self.mode.get(), self.get_precision())
+        except (ValueError, TypeError, ZeroDivisionError, InvalidOperation, OverflowError):
+            self.show_text("Error")
+
+    def button_factorial(self):
+        if self.evaluation is not None:
+            return
+        try:
+            self.start_evaluation(factorial, self.read_entry(), self.mode.get(), self.get_precision())
+        except (ValueError, InvalidOperation):
+            self.show_text("Error")
+
+
+if __name__ == "__main__":
+    tk_profiler.enable_from_command_line()
+    root = Tk()
+    Calculator(root)
+    root.mainloop()
@@ -3,13 +3,20 @@ from tkinter import messagebox
 import time
 import random
 
+import tk_profiler
+from connect4_engine import Engine, describe
+
+BOT_THINK_TIME = 0.3  # seconds the bot searches on its own turn
+PONDER_SLICE = 0.015  # seconds of pondering per event loop slice
+
 
 class Connect4Game:
     def __init__(self, root):
         self.root = root
-        self.root.title("Connect 4")
-        self.root.geometry("800x700")
-        self.root.minsize(700, 600)
+        self.window = root.winfo_toplevel()
+        self.window.title("Connect 4")
+        self.window.geometry("800x700")
+        self.window.minsize(700, 600)
 
         self.rows = 6
         self.columns = 7
@@ -20,6 +27,14 @@ class Connect4Game:
         self.is_button_disabled = False
         self.playing_against_bot = False
         self.current_player = 1
+        self.after_id = None
+        self.closed = False
+
+        # The engine keeps its search results between moves and games
+        self.engine = Engine()
+        self.bot_think_time = BOT_THINK_TIME
+        self.ponder_id = None
+        self.show_evaluation = tk.BooleanVar(self.root, value=False)
 
         self.create_menu()
 
@@ -31,7 +46,15 @@ class Connect4Game:
         tk.Label(self.root, text="Welcome to Connect 4!", font=("Arial", 24)).pack(pady=20)
         tk.Button(self.root, text="2 Player Game", font=("Arial", 18), command=self.start_2_player_game).pack(pady=10)
         tk.Button(self.root, text="Play Against Bot", font=("Arial", 18), command=self.start_bot_game).pack(pady=10)
-        tk.Button(self.root, text="Exit", font=("Arial", 18), command=self.root.destroy).pack(pady=10)
+        self.add_exit_button()
+
+    def add_exit_button(self):
+        """Exit closes the window, so it is only offered when the window is ours.
+
+        Inside the launcher the window is shared and the toolbar is the way out.
+        """
+        if self.root is self.window:
+            tk.Button(self.root, text="Exit", font=("Arial", 18), command=self.window.destroy).pack(pady=10)
 
     def start_2_player_game(self):
         """Start a 2-player game."""
@@ -68,6 +91,10 @@ class Connect4Game:
         for i in range(self.columns):
             self.buttons_frame.columnconfigure(i, weight=1)
 
+        if self.playing_against_bot:
+            tk.Checkbutton(self.buttons_frame, text="Show evaluation", variable=self.show_evaluation,
+                           command=self.update_evaluation).grid(row=1, column=0, columnspan=self.columns)
+
         self.canvas.bind("<Configure>", self.redraw)
 
     def redraw(self, event=None):
@@ -107,16 +134,19 @@ class Connect4Game:
         self.column_highlight = col
         self.redraw()
         self.disable_buttons()
-        self.root.after(200, lambda: self.drop_disk(col))
+        self.after_id = self.root.after(200, lambda: self.drop_disk(col))
 
     def drop_disk(self, col):
         """Animate the disk dropping into the selected column."""
+        self.after_id = None
         for row in range(self.rows - 1, -1, -1):
             if self.grid[row][col] == 0:
                 for anim_row in range(row + 1):
                     self.grid[anim_row][col] = self.current_player
                     self.redraw()
                     self.root.update()
+                    if self.closed:
+                        return
                     time.sleep(0.05)
                     self.grid[anim_row][col] = 0
                 self.grid[row][col] = self.current_player
@@ -137,37 +167,43 @@ class Connect4Game:
                 self.enable_buttons()
 
     def bot_move(self):
-        """Bot makes a move."""
+        """Bot makes a move, building on whatever it worked out while pondering."""
         self.disable_buttons()
-        time.sleep(0.3) 
-
-        valid_columns = [col for col in range(self.columns) if self.grid[0][col] == 0]
-        for col in valid_columns:
-            if self.simulate_move(col, 2):  # Bot tries to win
-                self.drop_disk(col)
-                return
-        for col in valid_columns:
-            if self.simulate_move(col, 1):  # Bot blocks player's winning move
-                self.drop_disk(col)
-                return
 
-        # Prioritize center column
-        if self.grid[0][self.columns // 2] == 0:
-            self.drop_disk(self.columns // 2)
-            return
-
-        # Random move
-        self.drop_disk(random.choice(valid_columns))
-
-    def simulate_move(self, col, player):
-        """Simulate a move for a player and check for a win."""
-        for row in range(self.rows - 1, -1, -1):
-            if self.grid[row][col] == 0:
-                self.grid[row][col] = player
-                win = self.check_winner(row, col)
-                self.grid[row][col] = 0
-                return win
-        return False
+        col = self.engine.best_move(self.grid, 2, self.bot_think_time)
+        if col is None:
+            col = random.choice([c for c in range(self.columns) if self.grid[0][c] == 0])
+        self.drop_disk(col)
+
+    def start_pondering(self):
+        """Search the human's likely moves in the background while they think."""
+        self.engine.ponder(self.grid, self.current_player)
+        self.ponder_id = self.root.after(1, self.ponder)
+
+    def ponder(self):
+        self.ponder_id = None
+        more = self.engine.step(PONDER_SLICE)
+        self.update_evaluation()
+        if more:
+            self.ponder_id = self.root.after(1, self.ponder)
+
+    def stop_pondering(self):
+        if self.ponder_id is not None:
+            self.root.after_cancel(self.ponder_id)
+            self.ponder_id = None
+        self.engine.stop()
+
+    def update_evaluation(self):
+        """Show what the engine thinks of each column on the column buttons."""
+        evaluations = {}
+        if self.show_evaluation.get() and not self.is_button_disabled:
+            evaluations = self.engine.evaluations(self.grid, self.current_player)
+        for col, button in enumerate(self.buttons):
+            text = "↓"
+            if col in evaluations:
+                text = f"↓ {describe(evaluations[col][0])}"
+            if button.cget("text") != text:
+                button.config(text=text)
 
     def check_winner(self, row, col):
         """Check if the current player has won."""
@@ -204,9 +240,13 @@ class Connect4Game:
                 y2 = y1 + self.cell_size - 2 * self.margin
                 self.canvas.create_oval(x1, y1, x2, y2, fill="green", outline="black")
             self.root.update()
+            if self.closed:
+                return
             time.sleep(0.3)
             self.redraw()
             self.root.update()
+            if self.closed:
+                return
             time.sleep(0.3)
 
         self.show_winner()
@@ -214,14 +254,26 @@ class Connect4Game:
     def disable_buttons(self):
         """Disable column buttons to prevent spamming."""
         self.is_button_disabled = True
+        self.stop_pondering()
         for button in self.buttons:
             button.config(state=tk.DISABLED)
+        self.update_evaluation()
 
     def enable_buttons(self):
         """Enable column buttons."""
         self.is_button_disabled = False
         for button in self.buttons:
             button.config(state=tk.NORMAL)
+        if self.playing_against_bot and self.current_player == 1:
+            self.start_pondering()
+
+    def close(self):
+        """Stop pondering, pending drops and any animation still running."""
+        self.closed = True
+        self.stop_pondering()
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
 
     def show_winner(self):
         """Display the winner."""
@@ -237,10 +289,11 @@ class Connect4Game:
         tk.Label(self.root, text="Game Over!", font=("Arial", 24)).pack(pady=20)
         tk.Button(self.root, text="Play Again (Same Mode)", font=("Arial", 18), command=self.initialize_game).pack(pady=10)
         tk.Button(self.root, text="Switch Game Mode", font=("Arial", 18), command=self.create_menu).pack(pady=10)
-        tk.Button(self.root, text="Exit", font=("Arial", 18), command=self.root.destroy).pack(pady=10)
+        self.add_exit_button()
 
 
 if __name__ == "__main__":
+    tk_profiler.enable_from_command_line()
     root = tk.Tk()
     Connect4Game(root)
     root.mainloop()
@@ -1,16 +1,33 @@
 import tkinter as tk
 import random
 
+import flappy_sprites
+import tk_profiler
+
+# Canvas items the game may ever have. They are all made up front and reused,
+# so screen changes and new pipes never create or delete anything.
+ITEM_BUDGET = 32
+
+# Background layers, back to front: sprite, top edge and pixels scrolled per frame
+LAYERS = (("clouds", 30, 1), ("hills", 450, 2))
+
+# The bird's wing positions in flapping order, each shown for a few frames
+BIRD_CYCLE = (0, 1, 2, 1)
+BIRD_FRAME_TICKS = 4
+
 class FlappyBirdGame:
     def __init__(self, root):
         self.root = root
-        self.root.title("Flappy Bird")
+        self.window = root.winfo_toplevel()
+        self.window.title("Flappy Bird")
 
         # Game settings
         self.window_width = 400
         self.window_height = 600
         self.pipe_width = 60
         self.pipe_gap = 150
+        self.pipe_speed = 5
+        self.bird_x = 50
         self.bird_size = 20
 
         # Initialize variables
@@ -21,51 +38,93 @@ class FlappyBirdGame:
         self.score = 0
         self.game_running = False
         self.pipe_spacing = 200
-        self.pipes = []
+        self.pipes = []  # [x, top pipe end, pool slot] for each pipe on screen
+        self.after_id = None
+        self.tick = 0
+        self.bird_frame = 0
+        self.layer_offsets = [0] * len(LAYERS)
+        self.items = 0
 
         # Canvas setup
         self.canvas = tk.Canvas(self.root, width=self.window_width, height=self.window_height, bg="skyblue")
         self.canvas.pack()
 
-        # Bird
-        self.bird = self.canvas.create_oval(
-            50, self.bird_y, 50 + self.bird_size, self.bird_y + self.bird_size, fill="yellow"
-        )
+        # Sprites are rendered once, the canvas only moves and swaps them
+        self.sprites = self.load_sprites()
+        self.build_scene()
 
         # Start screen
         self.start_screen()
 
         # Key bindings
-        self.root.bind("<space>", self.flap)
+        self.window.bind("<space>", self.flap)
+
+    def load_sprites(self):
+        def image(data):
+            return tk.PhotoImage(master=self.canvas, data=data)
+
+        return {
+            "bird": [image(flappy_sprites.bird(frame, self.bird_size)) for frame in range(flappy_sprites.BIRD_FRAMES)],
+            "pipe": image(flappy_sprites.pipe_body(self.pipe_width, self.window_height)),
+            "cap": image(flappy_sprites.pipe_cap(self.pipe_width + 2 * flappy_sprites.CAP_OVERHANG)),
+            "clouds": image(flappy_sprites.clouds(self.window_width, self.window_height // 3)),
+            "hills": image(flappy_sprites.hills(self.window_width, self.window_height - LAYERS[1][1])),
+        }
+
+    def new_item(self, kind, *args, **options):
+        """Create a canvas item, refusing to go over ITEM_BUDGET."""
+        if self.items >= ITEM_BUDGET:
+            raise RuntimeError(f"Flappy Bird is limited to {ITEM_BUDGET} canvas items")
+        self.items += 1
+        return getattr(self.canvas, "create_" + kind)(*args, **options)
+
+    def build_scene(self):
+        # Each background layer is two tiles side by side, scrolled as one tag
+        for i, (name, top, speed) in enumerate(LAYERS):
+            for tile in range(2):
+                self.new_item("image", tile * self.window_width, top, image=self.sprites[name], anchor="nw",
+                              tags=("layer", f"layer{i}"))
+
+        # A pool of pipes big enough for a full screen, all moved with the "pipes" tag
+        self.pipe_items = []
+        for slot in range(self.window_width // self.pipe_spacing + 2):
+            tags = ("pipes", f"pipe{slot}")
+            self.pipe_items.append((
+                self.new_item("image", 0, 0, image=self.sprites["pipe"], anchor="sw", tags=tags, state="hidden"),
+                self.new_item("image", 0, 0, image=self.sprites["cap"], anchor="sw", tags=tags, state="hidden"),
+                self.new_item("image", 0, 0, image=self.sprites["pipe"], anchor="nw", tags=tags, state="hidden"),
+                self.new_item("image", 0, 0, image=self.sprites["cap"], anchor="nw", tags=tags, state="hidden"),
+            ))
+        self.free_slots = list(range(len(self.pipe_items)))
+
+        # Bird
+        self.bird = self.new_item("image", self.bird_x, self.bird_y, image=self.sprites["bird"][0], anchor="nw",
+                                  state="hidden")
+
+        # Score and the three lines of the start and game over screens
+        self.score_text = self.new_item("text", 50, 30, font=("Arial", 16), fill="black", state="hidden")
+        self.messages = [
+            self.new_item("text", self.window_width // 2, self.window_height // 2 + dy, font=font, tags="message")
+            for dy, font in ((-20, ("Arial", 24, "bold")), (20, ("Arial", 16)), (50, ("Arial", 16)))
+        ]
+
+    def show_message(self, title, subtitle, prompt, color="black"):
+        """Hide the playfield and put up a title screen over the background."""
+        self.canvas.itemconfigure("pipes", state="hidden")
+        self.canvas.itemconfigure(self.bird, state="hidden")
+        self.canvas.itemconfigure(self.score_text, state="hidden")
+        for item, text, fill in zip(self.messages, (title, subtitle, prompt), (color, "black", "black")):
+            self.canvas.itemconfigure(item, text=text, fill=fill, state="normal")
 
     def start_screen(self):
-        self.canvas.delete("all")
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 - 20,
-            text="Flappy Bird",
-            font=("Arial", 24, "bold"),
-            fill="black"
-        )
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 + 20,
-            text="Press SPACE to Flap",
-            font=("Arial", 16),
-            fill="black"
-        )
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 + 50,
-            text="Press ENTER to Start",
-            font=("Arial", 16),
-            fill="black"
-        )
-        self.root.bind("<Return>", self.start_game)
+        self.show_message("Flappy Bird", "Press SPACE to Flap", "Press ENTER to Start")
+        self.window.bind("<Return>", self.start_game)
 
     def start_game(self, event=None):
-        self.root.unbind("<Return>")
-        self.canvas.delete("all")
+        self.window.unbind("<Return>")
+        self.canvas.itemconfigure("message", state="hidden")
+        self.canvas.itemconfigure("pipes", state="hidden")
+        self.free_slots = list(range(len(self.pipe_items)))
         self.bird_y = self.window_height // 2
         self.bird_velocity = 0
         self.score = 0
@@ -73,9 +132,9 @@ class FlappyBirdGame:
         self.game_running = True
 
         # Reset bird position
-        self.bird = self.canvas.create_oval(
-            50, self.bird_y, 50 + self.bird_size, self.bird_y + self.bird_size, fill="yellow"
-        )
+        self.canvas.coords(self.bird, self.bird_x, self.bird_y)
+        self.canvas.itemconfigure(self.bird, state="normal")
+        self.canvas.itemconfigure(self.score_text, text="Score: 0", state="normal")
 
         self.generate_initial_pipes()
         self.update_game()
@@ -89,13 +148,15 @@ class FlappyBirdGame:
         top_pipe_end = random.randint(100, self.window_height - self.pipe_gap - 100)
         bottom_pipe_start = top_pipe_end + self.pipe_gap
 
-        top_pipe = self.canvas.create_rectangle(
-            x, 0, x + self.pipe_width, top_pipe_end, fill="green"
-        )
-        bottom_pipe = self.canvas.create_rectangle(
-            x, bottom_pipe_start, x + self.pipe_width, self.window_height, fill="green"
-        )
-        self.pipes.append((top_pipe, bottom_pipe))
+        # Reuse a pipe that went off screen instead of creating new items
+        slot = self.free_slots.pop()
+        top_pipe, top_cap, bottom_pipe, bottom_cap = self.pipe_items[slot]
+        self.canvas.coords(top_pipe, x, top_pipe_end)
+        self.canvas.coords(top_cap, x - flappy_sprites.CAP_OVERHANG, top_pipe_end)
+        self.canvas.coords(bottom_pipe, x, bottom_pipe_start)
+        self.canvas.coords(bottom_cap, x - flappy_sprites.CAP_OVERHANG, bottom_pipe_start)
+        self.canvas.itemconfigure(f"pipe{slot}", state="normal")
+        self.pipes.append([x, top_pipe_end, slot])
 
     def flap(self, event=None):
         if self.game_running:
@@ -109,20 +170,22 @@ class FlappyBirdGame:
         self.bird_velocity += self.gravity
         self.bird_y += self.bird_velocity
         self.canvas.move(self.bird, 0, self.bird_velocity)
+        self.animate_bird()
 
         # Check for collisions
         if self.bird_y <= 0 or self.bird_y + self.bird_size >= self.window_height:
             self.end_game()
             return
 
-        # Move pipes and check collisions
+        # Move pipes and check collisions; positions are tracked here, not asked of the canvas
+        self.canvas.move("pipes", -self.pipe_speed, 0)
         new_pipes = []
-        for top_pipe, bottom_pipe in self.pipes:
-            self.canvas.move(top_pipe, -5, 0)
-            self.canvas.move(bottom_pipe, -5, 0)
+        for pipe in self.pipes:
+            pipe[0] -= self.pipe_speed
+            x, top_pipe_end, slot = pipe
 
-            top_coords = self.canvas.coords(top_pipe)
-            bottom_coords = self.canvas.coords(bottom_pipe)
+            top_coords = (x, 0, x + self.pipe_width, top_pipe_end)
+            bottom_coords = (x, top_pipe_end + self.pipe_gap, x + self.pipe_width, self.window_height)
 
             if self.check_collision(top_coords) or self.check_collision(bottom_coords):
                 self.end_game()
@@ -130,28 +193,53 @@ class FlappyBirdGame:
 
             # If the pipe is still on screen, keep it
             if top_coords[2] > 0:
-                new_pipes.append((top_pipe, bottom_pipe))
+                new_pipes.append(pipe)
             else:
+                self.canvas.itemconfigure(f"pipe{slot}", state="hidden")
+                self.free_slots.append(slot)
                 self.score += 1
+                self.canvas.itemconfigure(self.score_text, text=f"Score: {self.score}")
 
         self.pipes = new_pipes
 
         # Add new pipes when the last pipe is far enough
-        if len(self.pipes) > 0 and self.canvas.coords(self.pipes[-1][0])[2] < self.window_width - self.pipe_spacing:
+        if len(self.pipes) > 0 and self.pipes[-1][0] + self.pipe_width < self.window_width - self.pipe_spacing:
             self.add_pipe(self.window_width)
 
-        # Update score display
-        self.canvas.delete("score")
-        self.canvas.create_text(
-            50, 30, text=f"Score: {self.score}", font=("Arial", 16), fill="black", tag="score"
-        )
+        self.scroll_background()
+
+        self.after_id = self.root.after(20, self.update_game)
 
-        self.root.after(20, self.update_game)
+    def animate_bird(self):
+        """Flap the wings, swapping the bird's image only when the frame changes."""
+        self.tick += 1
+        frame = BIRD_CYCLE[self.tick // BIRD_FRAME_TICKS % len(BIRD_CYCLE)]
+        if frame != self.bird_frame:
+            self.bird_frame = frame
+            self.canvas.itemconfigure(self.bird, image=self.sprites["bird"][frame])
+
+    def scroll_background(self):
+        """Move every layer by its own speed, one canvas call per layer."""
+        for i, (name, top, speed) in enumerate(LAYERS):
+            self.layer_offsets[i] += speed
+            if self.layer_offsets[i] >= self.window_width:
+                # the second tile has reached the left edge, jump both back a tile
+                self.layer_offsets[i] -= self.window_width
+                self.canvas.move(f"layer{i}", self.window_width - speed, 0)
+            else:
+                self.canvas.move(f"layer{i}", -speed, 0)
+
+    def close(self):
+        """Stop the game loop and unbind space and return from the window."""
+        self.game_running = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.unbind("<space>")
+        self.window.unbind("<Return>")
 
     def check_collision(self, pipe_coords):
-        if not pipe_coords or len(pipe_coords) != 4:
-            return False
-        bird_coords = self.canvas.coords(self.bird)
+        bird_coords = (self.bird_x, self.bird_y, self.bird_x + self.bird_size, self.bird_y + self.bird_size)
         return not (
             bird_coords[2] < pipe_coords[0] or
             bird_coords[0] > pipe_coords[2] or
@@ -161,31 +249,11 @@ class FlappyBirdGame:
 
     def end_game(self):
         self.game_running = False
-        self.canvas.delete("all")
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 - 20,
-            text="You Died",
-            font=("Arial", 24, "bold"),
-            fill="red"
-        )
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 + 20,
-            text=f"Score: {self.score}",
-            font=("Arial", 16),
-            fill="black"
-        )
-        self.canvas.create_text(
-            self.window_width // 2,
-            self.window_height // 2 + 50,
-            text="Press ENTER to Restart",
-            font=("Arial", 16),
-            fill="black"
-        )
-        self.root.bind("<Return>", self.start_game)
+        self.show_message("You Died", f"Score: {self.score}", "Press ENTER to Restart", color="red")
+        self.window.bind("<Return>", self.start_game)
 
 if __name__ == "__main__":
+    tk_profiler.enable_from_command_line()
     root = tk.Tk()
     game = FlappyBirdGame(root)
     root.mainloop()
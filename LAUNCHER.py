@@ -0,0 +1,77 @@
+#one window for all the games and the calculator
+import time
+
+STARTED = time.perf_counter()
+
+import tkinter as tk
+
+import tk_profiler
+from script_loader import import_script
+
+# Button text, script and the class that builds it inside a frame
+PROGRAMS = [
+    ("Flappy Bird", "FLAPPYBIRD.py", "FlappyBirdGame"),
+    ("Connect 4", "CONNECT 4.py", "Connect4Game"),
+    ("Maze Game", "maze game.py", "MazeMenu"),
+    ("Calculator", "CALCULATOR.py", "Calculator"),
+]
+
+
+def load_program(filename, class_name):
+    """Import one of the scripts the first time it is needed and return its class."""
+    return getattr(import_script(filename), class_name)
+
+
+class Launcher:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Python Tkinter Games")
+        self.program = None
+        self.frame = None
+
+        self.toolbar = tk.Frame(self.root)
+        self.toolbar.pack(side="top", fill="x")
+        tk.Button(self.toolbar, text="Home", command=self.show_home).pack(side="left")
+        for name, filename, class_name in PROGRAMS:
+            tk.Button(self.toolbar, text=name, command=lambda n=name, f=filename, c=class_name: self.switch_to(n, f, c)).pack(side="left")
+
+        self.show_home()
+        print(f"Startup: {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+        self.root.after(0, self.report_first_frame)
+
+    def report_first_frame(self):
+        self.root.update_idletasks()
+        print(f"Time to first frame: {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+
+    def close_program(self):
+        """Take the current program down; the Tk root itself is kept."""
+        if self.program is not None and hasattr(self.program, "close"):
+            self.program.close()
+        self.program = None
+        if self.frame is not None:
+            self.frame.destroy()
+        self.frame = tk.Frame(self.root)
+        self.frame.pack(side="top", fill="both", expand=True)
+        # Connect 4 sizes the window itself, let the next program size it again
+        self.root.minsize(1, 1)
+        self.root.geometry("")
+        self.root.title("Python Tkinter Games")
+
+    def show_home(self):
+        self.close_program()
+        tk.Label(self.frame, text="Pick a game", font=("Arial", 24)).pack(padx=40, pady=40)
+
+    def switch_to(self, name, filename, class_name):
+        started = time.perf_counter()
+        self.close_program()
+        program_class = load_program(filename, class_name)
+        self.program = program_class(self.frame)
+        self.root.update_idletasks()
+        print(f"{name}: first frame in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    tk_profiler.enable_from_command_line()
+    root = tk.Tk()
+    Launcher(root)
+    root.mainloop()
@@ -0,0 +1,72 @@
+#frame-cost check on a real display: plays Flappy Bird under the profiler and
+#fails when its frames, Tk's redraw included, go over the 20 ms budget
+#
+#   python bench_display.py
+#   xvfb-run -a python bench_display.py --frames 3000 --output flappy_frames.json
+import argparse
+import sys
+import tkinter as tk
+
+import tk_profiler
+from bench_rendering import flappy_autopilot
+from script_loader import import_script
+
+FRAME = "FlappyBirdGame.update_game"
+
+# Share of frames that may go over budget, for the odd scheduler hiccup
+ALLOWED_OVER_BUDGET = 0.01
+
+# How often the autopilot looks at the game, in ms; a few times per tick
+PILOT_INTERVAL = 5
+
+
+def run(frames, output):
+    """Play until update_game has run frames times; returns its profiler stats and the crash count."""
+    profiler = tk_profiler.enable(output)
+    FlappyBirdGame = import_script("FLAPPYBIRD.py").FlappyBirdGame
+    root = tk.Tk()
+    game = FlappyBirdGame(root)
+    crashes = -1  # the first start is not a crash
+
+    def pilot():
+        nonlocal crashes
+        if profiler.frames.get(FRAME, {}).get("frames", 0) >= frames:
+            game.close()
+            root.quit()
+            return
+        if not game.game_running:
+            crashes += 1
+            game.start_game()
+        else:
+            flappy_autopilot(game)
+        root.after(PILOT_INTERVAL, pilot)
+
+    root.after(PILOT_INTERVAL, pilot)
+    root.mainloop()
+    root.destroy()
+    return profiler.report()["frames"][FRAME], crashes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check Flappy Bird's frames fit the budget on a real display.")
+    parser.add_argument("--frames", type=int, default=1500, help="game ticks to play (default: %(default)s)")
+    parser.add_argument("--output", default=tk_profiler.DEFAULT_OUTPUT, help="where the full profile is written")
+    args = parser.parse_args(argv)
+
+    try:
+        stats, crashes = run(args.frames, args.output)
+    except tk.TclError as error:
+        parser.exit(2, f"error: {error} (run it on a desktop or under xvfb-run)\n")
+
+    allowed = int(stats["frames"] * ALLOWED_OVER_BUDGET)
+    print(f"{stats['frames']} frames, {crashes} crashes: {stats['ms_per_frame']:.2f} ms/frame "
+          f"of which {stats['draw_ms_per_frame']:.2f} ms redraw, max {stats['max_seconds'] * 1000:.2f} ms, "
+          f"{stats['over_budget']} over the {tk_profiler.FRAME_BUDGET_MS} ms budget (allowed {allowed})")
+    if stats["over_budget"] > allowed:
+        print("FAIL frames do not fit the budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#headless rendering benchmarks: replays scripted sessions on the recording fake canvas
+#
+#   python bench_rendering.py            # run everything, exit 1 if a budget is blown
+#   python bench_rendering.py flappy --frames 2000 --json results.json
+#
+#The fake canvas never draws anything, so the times reported here are the
+#programs' own Python work only. What the frames cost on screen, redraw
+#included, is checked against the budget by bench_display.py on a display.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import types
+from collections import deque
+
+import fake_tk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Limits per scenario; going over any of them is a regression
+BUDGETS = {
+    # Flappy Bird may never go over its ITEM_BUDGET of 32 items
+    "flappy": {"ops_per_frame": 8, "max_ops_per_frame": 40, "peak_live_items": 32},
+    "connect4": {"ops_per_frame": 350, "max_ops_per_frame": 1000, "peak_live_items": 60},
+    "maze": {"ops_per_frame": 100, "max_ops_per_frame": 2100, "peak_live_items": 2100},
+    "calculator": {"ops_per_frame": 4, "max_ops_per_frame": 4, "largest_text": 80},
+}
+
+# Live items may not keep climbing: the last quarter of a run may not peak
+# higher than this many times the first quarter
+GROWTH_FACTOR = 1.5
+
+
+def _module_globals(cls):
+    return cls.__init__.__globals__
+
+
+def _without_sleeping(cls):
+    # the Connect 4 animations sleep, which would only slow the benchmark down
+    _module_globals(cls)["time"] = types.SimpleNamespace(sleep=lambda seconds: None)
+
+
+def flappy_autopilot(game):
+    """Flap when the next gap's bottom edge is coming up."""
+    for x, top_pipe_end, _ in game.pipes:
+        if x + game.pipe_width >= game.bird_x:
+            gap_bottom = top_pipe_end + game.pipe_gap
+            if game.bird_y + game.bird_size + game.bird_velocity + game.gravity > gap_bottom - 15:
+                game.flap()
+            return
+
+
+def bench_flappy(frames=10000):
+    """Play Flappy Bird with a simple autopilot, restarting on every crash."""
+    FlappyBirdGame = fake_tk.load_program("FLAPPYBIRD.py", "FlappyBirdGame")
+    random.seed(0)
+    root = fake_tk.Tk()
+    game = root.call(FlappyBirdGame, root)
+    crashes = 0
+    root.event_generate("<Return>")
+    while root.recorder.frame < frames:
+        if not game.game_running:
+            crashes += 1
+            root.event_generate("<Return>")
+            continue
+        flappy_autopilot(game)
+        root.step()
+    return root.recorder, {"crashes": crashes}
+
+
+def bench_connect4(games=20, ponder_frames=3):
+    """Play whole games against the bot, picking random columns for the human.
+
+    The human "thinks" for a few frames each turn, so the bot ponders and
+    redraws its evaluation overlay in between moves.
+    """
+    Connect4Game = fake_tk.load_program("CONNECT 4.py", "Connect4Game")
+    _without_sleeping(Connect4Game)
+    random.seed(0)
+    root = fake_tk.Tk()
+    game = root.call(Connect4Game, root)
+    game.bot_think_time = 0.01
+    game.show_evaluation.set(True)
+    root.call(game.start_bot_game)
+    game.canvas.event_generate("<Configure>")
+    finished = 0
+    while finished < games:
+        if not game.canvas.winfo_exists() or all(game.grid[0][c] for c in range(game.columns)):
+            finished += 1
+            root.call(game.initialize_game)
+            game.canvas.event_generate("<Configure>")
+            continue
+        column = random.choice([c for c in range(game.columns) if game.grid[0][c] == 0])
+        game.buttons[column].invoke()
+        while game.ponder_id is None and root.step():
+            pass
+        root.run(frames=ponder_frames)
+    return root.recorder, {"games": finished}
+
+
+def _solve(maze, start, goal):
+    """Key presses that walk from start to goal."""
+    keys = {(-1, 0): "Up", (1, 0): "Down", (0, -1): "Left", (0, 1): "Right"}
+    came_from = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            break
+        for dr, dc in keys:
+            nxt = (cell[0] + dr, cell[1] + dc)
+            if maze[nxt[0]][nxt[1]] == 0 and nxt not in came_from:
+                came_from[nxt] = cell
+                queue.append(nxt)
+    path = []
+    cell = goal
+    while came_from[cell] is not None:
+        previous = came_from[cell]
+        path.append(keys[(cell[0] - previous[0], cell[1] - previous[1])])
+        cell = previous
+    return path[::-1]
+
+
+def bench_maze(draws=10):
+    """Draw hard mazes over and over, then walk the last one to its exit."""
+    MazeMenu = fake_tk.load_program("maze game.py", "MazeMenu")
+    random.seed(0)
+    root = fake_tk.Tk()
+    menu = root.call(MazeMenu, root)
+    rows, cols = _module_globals(MazeMenu)["MAZE_SIZES"]["hard"]
+    for _ in range(draws):
+        root.call(menu.start_game, rows, cols, 150)
+        root.run(ms=3000)  # a few timer ticks
+    game = menu.game
+    for key in _solve(game.maze, (1, 1), tuple(game.exit_pos)):
+        root.event_generate("<KeyPress>", keysym=key)
+    return root.recorder, {"draws": draws, "won": game.game_over}
+
+
+def bench_calculator(rounds=5):
+    """Produce huge results and check only a short string ever reaches the entry."""
+    Calculator = fake_tk.load_program("CALCULATOR.py", "Calculator")
+    root = fake_tk.Tk()
+    calculator = root.call(Calculator, root)
+
+    def press(text):
+        calculator.e.delete(0, fake_tk.END)
+        calculator.e.insert(0, text)
+
+    def wait():
+        while calculator.evaluation is not None:
+            time.sleep(0.005)
+            root.step()
+
+    for i in range(rounds):
+        press(str(9 + i))
+        root.call(calculator.button_power)
+        press("99999")
+        root.call(calculator.button_equal)
+        wait()
+        press(str(20000 + 1000 * i))
+        root.call(calculator.button_factorial)
+        wait()
+    return root.recorder, {"result": calculator.e.get()}
+
+
+SCENARIOS = {
+    "flappy": (bench_flappy, 10000),
+    "connect4": (bench_connect4, 20),
+    "maze": (bench_maze, 10),
+    "calculator": (bench_calculator, 5),
+}
+
+
+def check(name, summary, frame_live):
+    """Return the budgets the scenario went over."""
+    failures = []
+    for key, limit in BUDGETS[name].items():
+        if summary[key] > limit:
+            failures.append(f"{key} {summary[key]:.1f} > {limit}")
+    quarter = len(frame_live) // 4
+    if quarter:
+        first, last = max(frame_live[:quarter]), max(frame_live[-quarter:])
+        if last > max(first, 1) * GROWTH_FACTOR:
+            failures.append(f"canvas items keep growing: {first} -> {last}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay scripted sessions on the fake canvas and check the budgets.")
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all of them)")
+    parser.add_argument("--frames", type=int, help="Flappy Bird frames to run")
+    parser.add_argument("--json", help="write the results to this file as well")
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+
+    os.chdir(HERE)  # the maze loads player.gif from the current folder
+    results = {}
+    failed = False
+    for name in args.scenarios or SCENARIOS:
+        bench, size = SCENARIOS[name]
+        if name == "flappy" and args.frames:
+            size = args.frames
+        started = time.perf_counter()
+        recorder, details = bench(size)
+        summary = recorder.summary()
+        summary.update(details, seconds=time.perf_counter() - started)
+        summary["failures"] = check(name, summary, recorder.frame_live)
+        results[name] = summary
+        failed = failed or bool(summary["failures"])
+
+        print(f"{name}: {summary['frames']} frames, {summary['ops_per_frame']:.1f} ops/frame "
+              f"(max {summary['max_ops_per_frame']}), {summary['peak_live_items']} peak items, "
+              f"{summary['ms_per_frame']:.3f} ms/frame in Python (p99 {summary['p99_ms_per_frame']:.3f}), "
+              f"{summary['seconds']:.2f}s")
+        for failure in summary["failures"]:
+            print(f"  FAIL {failure}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#column mode for the calculator: one expression applied to whole columns of numbers
+import argparse
+import ast
+import csv
+import os
+import sys
+from itertools import islice
+
+# Rows read, evaluated and written at a time
+CHUNK_ROWS = 65536
+
+# Significant digits written per result. 17 digits read back as exactly
+# the same float, so nothing is lost by default; fewer can be asked for
+# when shorter output matters more than the last bits.
+MAX_DIGITS = 17
+DIGITS = MAX_DIGITS
+
+# NumPy functions an expression may call
+FUNCTIONS = ("abs", "sqrt", "exp", "log", "log10", "sin", "cos", "tan", "floor", "ceil", "minimum", "maximum")
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+)
+
+
+def compile_expression(text):
+    """Check an expression and compile it once; returns (code, variable names)."""
+    text = text.replace("^", "**").strip()
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Not an expression: {text}")
+
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported expression: {ast.get_source_segment(text, node) or text}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"Unsupported value: {node.value!r}")
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS) or node.keywords:
+                raise ValueError(f"Unsupported function: {ast.get_source_segment(text, node.func)}")
+        elif isinstance(node, ast.Name) and node.id not in FUNCTIONS:
+            names.add(node.id)
+    return compile(tree, "<expression>", "eval"), names
+
+
+def parse_binding(spec):
+    """Turn ``name=path`` or ``name=file.csv:column`` into (name, path, column)."""
+    name, sep, source = spec.partition("=")
+    name = name.strip()
+    if not sep or not name.isidentifier():
+        raise ValueError(f"Expected name=path[:column], got: {spec}")
+    path, column = source, None
+    if not os.path.exists(source):
+        head, sep, tail = source.rpartition(":")
+        if sep and os.path.exists(head):
+            path, column = head, tail
+    return name, path, column
+
+
+def _read_chunks(path, columns, chunk_rows):
+    """Yield 2D float arrays, one column per entry in columns, chunk_rows rows at a time.
+
+    Files ending in .csv have a header row and columns are picked by name;
+    anything else is read as one number per line. Blank lines are skipped
+    here rather than by loadtxt, so every chunk holds exactly chunk_rows
+    rows and chunks of different files stay lined up.
+    """
+    import numpy as np
+
+    with open(path, newline="") as f:
+        if path.lower().endswith(".csv"):
+            header = [h.strip() for h in next(csv.reader([f.readline()]), [])]
+            missing = [c for c in columns if c not in header]
+            if missing:
+                raise ValueError(f"{path} has no column {missing[0]!r}")
+            usecols = [header.index(c) for c in columns]
+            delimiter = ","
+        else:
+            if any(c is not None for c in columns):
+                raise ValueError(f"{path} is not a CSV file, it has no named columns")
+            usecols = [0] * len(columns)
+            delimiter = None
+
+        while True:
+            lines = []
+            while len(lines) < chunk_rows:
+                more = list(islice(f, chunk_rows - len(lines)))
+                if not more:
+                    break
+                lines += filter(str.strip, more)
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2, dtype=np.float64, comments=None)
+
+
+def evaluate_columns(expression, bindings, out, chunk_rows=CHUNK_ROWS, digits=DIGITS):
+    """Evaluate expression over every row of the bound columns and write one result per line.
+
+    bindings is a list of (name, path, column) tuples as made by
+    parse_binding. Each file is read once however many variables it feeds,
+    and the work is done a chunk at a time so the input never has to fit
+    in memory. Results are written with the given number of significant
+    digits. Returns the number of rows written.
+    """
+    # NumPy is imported here rather than at the top, so the calculator
+    # does not pay for loading it until column mode is actually used
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("Column mode needs NumPy (pip install numpy)")
+
+    if chunk_rows < 1:
+        raise ValueError("Chunk rows must be at least 1")
+    if not 1 <= digits <= MAX_DIGITS:
+        raise ValueError(f"Digits must be between 1 and {MAX_DIGITS}")
+    line_format = f"%.{digits}g\n"
+
+    code, names = compile_expression(expression)
+    bound = {name for name, _, _ in bindings}
+    missing = sorted(names - bound)
+    if missing:
+        raise ValueError(f"No column bound to {missing[0]!r}")
+
+    files = {}
+    for name, path, column in bindings:
+        if name in names:
+            if column is None and path.lower().endswith(".csv"):
+                column = name
+            files.setdefault(path, []).append((name, column))
+    readers = [(entries, _read_chunks(path, [c for _, c in entries], chunk_rows)) for path, entries in files.items()]
+    if not readers:
+        raise ValueError("Bind at least one column, e.g. x=values.txt")
+
+    namespace = {"__builtins__": {}}
+    namespace.update((function, getattr(np, function)) for function in FUNCTIONS)
+    rows = 0
+    with np.errstate(all="ignore"):
+        while True:
+            chunks = [next(reader, None) for _, reader in readers]
+            if all(chunk is None for chunk in chunks):
+                return rows
+            if any(chunk is None for chunk in chunks) or len({len(chunk) for chunk in chunks}) > 1:
+                raise ValueError("The bound columns have different lengths")
+
+            for (entries, _), chunk in zip(readers, chunks):
+                for i, (name, _) in enumerate(entries):
+                    namespace[name] = chunk[:, i]
+            length = len(chunks[0])
+            result = np.broadcast_to(np.asarray(eval(code, namespace), dtype=np.float64), (length,))
+            # one bulk % format is much quicker than formatting value by value
+            out.write((line_format * length) % tuple(result.tolist()))
+            rows += length
+
+
+def evaluate_columns_to_file(expression, bindings, output_path, chunk_rows=CHUNK_ROWS, digits=DIGITS):
+    """evaluate_columns writing to output_path; used by the calculator window."""
+    with open(output_path, "w") as out:
+        return evaluate_columns(expression, bindings, out, chunk_rows, digits)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply one calculator expression to whole columns of numbers.")
+    parser.add_argument("expression", help='for example "price * (1 + tax) ^ 2"')
+    parser.add_argument("--var", action="append", default=[], metavar="NAME=PATH[:COLUMN]",
+                        help="bind a variable to a newline-delimited file or a CSV column (repeatable)")
+    parser.add_argument("-o", "--output", help="file to write results to (default: stdout)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows evaluated at a time")
+    parser.add_argument("--digits", type=int, default=DIGITS,
+                        help="significant digits per result; the default reads back exactly, "
+                             "fewer round the results (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        bindings = [parse_binding(spec) for spec in args.var]
+        if args.output:
+            rows = evaluate_columns_to_file(args.expression, bindings, args.output, args.chunk_rows, args.digits)
+        else:
+            rows = evaluate_columns(args.expression, bindings, sys.stdout, args.chunk_rows, args.digits)
+    except (ValueError, RuntimeError, OSError) as error:
+        parser.exit(1, f"error: {error}\n")
+    print(f"{rows} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#number modes and result formatting for the calculator
+import ast
+import math
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+# Number modes the calculator can work in
+MODES = ("float", "decimal", "fraction")
+
+DEFAULT_PRECISION = 28
+MAX_PRECISION = 1000
+
+# Integers with more digits than this are shown in scientific notation
+MAX_DISPLAY_DIGITS = 64
+
+LOG10_2 = math.log10(2)
+
+
+def parse_number(text, mode, precision=DEFAULT_PRECISION):
+    """Turn the text in the entry into a number for the given mode."""
+    text = text.strip()
+    if mode == "fraction":
+        return Fraction(text)
+    if mode == "decimal":
+        with localcontext() as ctx:
+            ctx.prec = precision
+            return +Decimal(text)  # unary plus rounds to the context precision
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def apply_operation(operation, first, second, precision=DEFAULT_PRECISION):
+    """Apply one of the calculator operations to two parsed numbers."""
+    with localcontext() as ctx:
+        ctx.prec = precision
+        if operation == "addition":
+            return first + second
+        if operation == "subtraction":
+            return first - second
+        if operation == "multiplication":
+            return first * second
+        if operation == "division":
+            return first / second
+        if operation == "power":
+            return first ** second
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def factorial(value, mode, precision=DEFAULT_PRECISION):
+    """Factorial of a whole, non-negative number in the given mode."""
+    if value < 0 or value != int(value):
+        raise ValueError("Factorial needs a whole, non-negative number")
+    result = math.factorial(int(value))
+    if mode == "fraction":
+        return Fraction(result)
+    if mode == "decimal":
+        with localcontext() as ctx:
+            ctx.prec = precision
+            return +Decimal(result)
+    return result
+
+
+_OPERATIONS = {
+    ast.Add: "addition",
+    ast.Sub: "subtraction",
+    ast.Mult: "multiplication",
+    ast.Div: "division",
+    ast.Pow: "power",
+}
+
+
+def evaluate_expression(text, mode, precision=DEFAULT_PRECISION):
+    """Evaluate an expression typed into the entry, e.g. ``9**9**7`` or ``factorial(20) / 3``.
+
+    Only numbers, + - * / ** (or ^), brackets and factorial() are allowed.
+    """
+    text = text.replace("^", "**").strip()
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Not an expression: {text}")
+
+    def evaluate(node):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return parse_number(ast.get_source_segment(text, node), mode, precision)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = evaluate(node.operand)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATIONS:
+            return apply_operation(_OPERATIONS[type(node.op)], evaluate(node.left), evaluate(node.right), precision)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "factorial"
+                and len(node.args) == 1 and not node.keywords):
+            return factorial(evaluate(node.args[0]), mode, precision)
+        raise ValueError(f"Unsupported expression: {ast.get_source_segment(text, node)}")
+
+    return evaluate(tree.body)
+
+
+def log10_int(n):
+    """log10 of a positive int of any size, without converting it to a string."""
+    shift = max(n.bit_length() - 64, 0)
+    return math.log10(n >> shift) + shift * LOG10_2
+
+
+def format_scientific(numerator, denominator=1, sign=""):
+    """Format the positive fraction numerator/denominator in scientific notation.
+
+    The digits are worked out exactly with integer division, so the mantissa
+    is correctly rounded however big the numbers are. The float log is only
+    used to guess the exponent, which is then corrected by one either way.
+    The bigger the exponent the fewer decimals are kept, so the text stays
+    about the same length.
+    """
+    exponent = math.floor(log10_int(numerator) - log10_int(denominator))
+    decimals = max(1, 15 - len(str(abs(exponent))))
+    while True:
+        shift = exponent - decimals
+        if shift >= 0:
+            mantissa, remainder = divmod(numerator, denominator * 10 ** shift)
+            divisor = denominator * 10 ** shift
+        else:
+            mantissa, remainder = divmod(numerator * 10 ** -shift, denominator)
+            divisor = denominator
+        if mantissa >= 10 ** (decimals + 1):
+            exponent += 1
+        elif mantissa < 10 ** decimals:
+            exponent -= 1
+        else:
+            break
+    if 2 * remainder >= divisor:
+        mantissa += 1
+        if mantissa == 10 ** (decimals + 1):
+            mantissa //= 10
+            exponent += 1
+    digits = str(mantissa)
+    return f"{sign}{digits[0]}.{digits[1:]}e{exponent:+d}"
+
+
+def format_int(n):
+    """Format an int, switching to scientific notation once it gets huge.
+
+    str() on a 100k digit number is quadratic (and refused outright past
+    sys.get_int_max_str_digits), so the digit count is estimated from the
+    bit length first and only small numbers are converted exactly.
+    """
+    if n.bit_length() * LOG10_2 < MAX_DISPLAY_DIGITS:
+        return str(n)
+    sign = "-" if n < 0 else ""
+    return format_scientific(abs(n), sign=sign)
+
+
+def format_result(value):
+    """Format a result so it can be put in the entry quickly."""
+    if isinstance(value, int):
+        return format_int(value)
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return format_int(value.numerator)
+        if max(value.numerator.bit_length(), value.denominator.bit_length()) * LOG10_2 < MAX_DISPLAY_DIGITS:
+            return f"{value.numerator}/{value.denominator}"
+        sign = "-" if value < 0 else ""
+        return format_scientific(abs(value.numerator), value.denominator, sign)
+    # floats and Decimals are already bounded by their precision
+    return str(value)
@@ -0,0 +1,109 @@
+#runs calculator work in a separate process so the window never freezes
+import multiprocessing
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Default budgets for one evaluation
+DEFAULT_TIMEOUT = 30  # seconds of wall clock time
+DEFAULT_CPU_LIMIT = 20  # seconds of CPU time
+DEFAULT_MEMORY_LIMIT = 1024 * 1024 * 1024  # bytes of address space
+
+BUDGET_EXCEEDED = "Went over the CPU or memory budget"
+
+
+def _set_limit(which, value):
+    try:
+        resource.setrlimit(which, (value, value))
+    except (ValueError, OSError):
+        pass
+
+
+def _run(connection, func, args, cpu_limit, memory_limit):
+    """Body of the worker process: apply the budgets, run func and send back the outcome."""
+    if resource is not None:
+        if cpu_limit:
+            _set_limit(resource.RLIMIT_CPU, cpu_limit)
+        if memory_limit:
+            _set_limit(resource.RLIMIT_AS, memory_limit)
+    try:
+        connection.send(("ok", func(*args)))
+    except MemoryError:
+        connection.send(("error", "Out of memory"))
+    except ZeroDivisionError:
+        connection.send(("error", "Division by zero"))
+    except ArithmeticError as error:
+        # decimal signals and Fraction put raw reprs in their messages
+        connection.send(("error", type(error).__name__))
+    except Exception as error:
+        connection.send(("error", str(error) or type(error).__name__))
+    finally:
+        connection.close()
+
+
+class BackgroundEvaluation:
+    """Run func(*args) in a worker process and collect the result by polling.
+
+    Meant to be polled from root.after() so the Tk main loop keeps running
+    while the work happens. The worker is killed if it runs past the
+    timeout, and the CPU and memory limits are enforced by the OS where
+    the resource module is available.
+    """
+
+    def __init__(self, func, args, timeout=DEFAULT_TIMEOUT, cpu_limit=DEFAULT_CPU_LIMIT,
+                 memory_limit=DEFAULT_MEMORY_LIMIT):
+        # the platform's default start method: fork is unsafe on macOS once
+        # Tk is up, and the scripts guard their start-up with __main__ for spawn
+        context = multiprocessing.get_context()
+        self.timeout = timeout
+        self.done = False
+        self.result = None
+        self.error = None
+        self.started = time.monotonic()
+
+        self._receiver, sender = context.Pipe(duplex=False)
+        self.process = context.Process(target=_run, args=(sender, func, args, cpu_limit, memory_limit), daemon=True)
+        self.process.start()
+        sender.close()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def poll(self):
+        """Return True once the evaluation has finished, failed or been stopped."""
+        if self.done:
+            return True
+        alive = self.process.is_alive()
+        if self._receiver.poll():
+            try:
+                status, payload = self._receiver.recv()
+            except EOFError:
+                status, payload = "error", BUDGET_EXCEEDED
+            if status == "ok":
+                self.result = payload
+            else:
+                self.error = payload
+            self._finish()
+        elif not alive:
+            self.error = BUDGET_EXCEEDED
+            self._finish()
+        elif self.timeout and self.elapsed() > self.timeout:
+            self.error = "Timed out"
+            self._finish()
+        return self.done
+
+    def cancel(self):
+        """Kill the worker if it is still running."""
+        if not self.done:
+            self.error = "Cancelled"
+            self._finish()
+
+    def _finish(self):
+        self.done = True
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self._receiver.close()
@@ -0,0 +1,284 @@
+#search engine for the Connect 4 bot, with pondering and a transposition table kept across moves
+#
+#Boards are bitboards: each column takes HEIGHT + 1 bits, bottom row first,
+#with a spare bit on top so shifts never carry into the next column.
+#"position" holds the stones of the player to move and "mask" all stones.
+#
+#The search is written as generators that yield every few hundred nodes,
+#so the game can run it in short slices from root.after() and stay responsive.
+import time
+
+WIDTH = 7
+HEIGHT = 6
+H1 = HEIGHT + 1
+CELLS = WIDTH * HEIGHT
+
+WIN = 1000  # a win with n stones on the board scores WIN - n
+DECISIVE = WIN - CELLS  # scores beyond this are forced wins or losses
+INFINITY = WIN + 1
+
+BOTTOM = sum(1 << col * H1 for col in range(WIDTH))
+BOARD = BOTTOM * ((1 << HEIGHT) - 1)
+
+# Centre columns first, they take part in the most lines
+ORDER = sorted(range(WIDTH), key=lambda col: abs(col - WIDTH // 2))
+
+# Nodes searched between yields back to the event loop
+NODES_PER_YIELD = 512
+
+# Transposition table entries kept before it is cleared
+MAX_TABLE_SIZE = 300000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def bottom_mask(col):
+    return 1 << col * H1
+
+
+def top_mask(col):
+    return 1 << (HEIGHT - 1 + col * H1)
+
+
+def column_mask(col):
+    return ((1 << HEIGHT) - 1) << col * H1
+
+
+def position_from_grid(grid, player):
+    """Bitboards for a game grid (row 0 at the top) with player to move."""
+    position = mask = 0
+    for row, cells in enumerate(grid):
+        for col, cell in enumerate(cells):
+            if cell:
+                bit = 1 << (col * H1 + HEIGHT - 1 - row)
+                mask |= bit
+                if cell == player:
+                    position |= bit
+    return position, mask
+
+
+def can_play(mask, col):
+    return not mask & top_mask(col)
+
+
+def play(position, mask, col):
+    """Drop a stone for the player to move; returns the board from the opponent's side."""
+    return position ^ mask, mask | (mask + bottom_mask(col))
+
+
+def aligned(position):
+    """True if position has four in a row anywhere."""
+    for shift in (1, H1, H1 - 1, H1 + 1):
+        pairs = position & (position >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+def is_winning_move(position, mask, col):
+    return aligned(position | ((mask + bottom_mask(col)) & column_mask(col)))
+
+
+def winning_cells(position, mask):
+    """Empty cells that would complete four in a row for position."""
+    cells = (position << 1) & (position << 2) & (position << 3)
+    for shift in (H1, H1 - 1, H1 + 1):
+        pair = (position << shift) & (position << 2 * shift)
+        cells |= pair & (position << 3 * shift)
+        cells |= pair & (position >> shift)
+        pair = (position >> shift) & (position >> 2 * shift)
+        cells |= pair & (position << shift)
+        cells |= pair & (position >> 3 * shift)
+    return cells & (BOARD ^ mask)
+
+
+def evaluate(position, mask):
+    """Score a quiet position by the open threes each side has."""
+    return winning_cells(position, mask).bit_count() - winning_cells(position ^ mask, mask).bit_count()
+
+
+def describe(score):
+    """Short label for a score, as shown over the columns."""
+    if score > DECISIVE:
+        return "win"
+    if score < -DECISIVE:
+        return "lose"
+    return f"{score:+d}"
+
+
+class Engine:
+    """Alpha-beta search whose results outlive the move they were made for.
+
+    The transposition table and the per-position root analyses are kept
+    between moves and between games, so whatever was searched while
+    pondering on the human's turn is reused when the bot has to move.
+    """
+
+    def __init__(self):
+        self.table = {}  # position key -> (depth, value, flag, best column)
+        self.analysis = {}  # position key -> (depth, {column: score}) for the player to move
+        self.nodes = 0
+        self.job = None
+
+    # searching
+
+    def negamax(self, position, mask, moves, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes % NODES_PER_YIELD:
+            yield
+        for col in ORDER:
+            if can_play(mask, col) and is_winning_move(position, mask, col):
+                return WIN - moves - 1
+        if moves >= CELLS - 1:
+            return 0  # the last stone cannot win, checked above
+        if depth <= 0:
+            return evaluate(position, mask)
+
+        key = position + mask
+        entry = self.table.get(key)
+        hint = None
+        if entry is not None:
+            entry_depth, value, flag, hint = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best, best_col = -INFINITY, None
+        for col in ([hint] if hint is not None else []) + [c for c in ORDER if c != hint]:
+            if not can_play(mask, col):
+                continue
+            child_position, child_mask = play(position, mask, col)
+            value = -(yield from self.negamax(child_position, child_mask, moves + 1, depth - 1, -beta, -alpha))
+            if value > best:
+                best, best_col = value, col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if len(self.table) >= MAX_TABLE_SIZE:
+            self.table.clear()
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.table[key] = (depth, best, flag, best_col)
+        return best
+
+    def analyse(self, position, mask, depth):
+        """Score every column for the player to move and store it as the position's analysis."""
+        key = position + mask
+        moves = mask.bit_count()
+        previous = self.analysis.get(key)
+        order = ORDER
+        if previous is not None:
+            order = sorted(previous[1], key=previous[1].get, reverse=True)
+        scores = {}
+        for col in order:
+            if not can_play(mask, col):
+                continue
+            if is_winning_move(position, mask, col):
+                scores[col] = WIN - moves - 1
+                continue
+            child_position, child_mask = play(position, mask, col)
+            scores[col] = -(yield from self.negamax(child_position, child_mask, moves + 1, depth - 1, -INFINITY, INFINITY))
+        self.analysis[key] = (depth, scores)
+
+    def deepen(self, position, mask):
+        """Analyse ever deeper, starting past whatever is already known."""
+        key = position + mask
+        depth = self.analysis[key][0] + 1 if key in self.analysis else 1
+        while depth <= CELLS - mask.bit_count():
+            yield from self.analyse(position, mask, depth)
+            if abs(max(self.analysis[key][1].values())) > DECISIVE:
+                return  # a forced win, or nothing but losses
+            depth += 1
+
+    def ponder_replies(self, position, mask):
+        """While the opponent thinks, analyse the positions after each of their replies.
+
+        Replies that look best for the opponent are searched first, and
+        every reply is taken one level deeper per pass.
+        """
+        depth = 1
+        while depth <= CELLS - mask.bit_count():
+            evaluations = self.evaluations_for(position, mask)
+            replies = sorted(evaluations, key=lambda col: evaluations[col][0], reverse=True)
+            replies += [col for col in ORDER if col not in evaluations and can_play(mask, col)]
+            for col in replies:
+                if is_winning_move(position, mask, col):
+                    continue
+                child_position, child_mask = play(position, mask, col)
+                if child_mask.bit_count() == CELLS:
+                    continue
+                known = self.analysis.get(child_position + child_mask)
+                if known is None or known[0] < depth:
+                    yield from self.analyse(child_position, child_mask, depth)
+            depth += 1
+
+    # driving the search
+
+    def run(self, job, seconds):
+        """Advance a search generator for up to seconds; returns False once it is finished."""
+        deadline = time.perf_counter() + seconds
+        for _ in job:
+            if time.perf_counter() >= deadline:
+                return True
+        return False
+
+    def ponder(self, grid, player):
+        """Start pondering a position where player, the human, is to move."""
+        self.job = self.ponder_replies(*position_from_grid(grid, player))
+
+    def step(self, seconds):
+        """Ponder for a slice of time; returns False when there is nothing left to do."""
+        if self.job is None:
+            return False
+        if not self.run(self.job, seconds):
+            self.job = None
+        return self.job is not None
+
+    def stop(self):
+        self.job = None
+
+    def best_move(self, grid, player, seconds):
+        """The best column for player, searching for up to seconds on top of what is known."""
+        self.stop()
+        position, mask = position_from_grid(grid, player)
+        key = position + mask
+        job = self.deepen(position, mask)
+        deadline = time.perf_counter() + seconds
+        # always finish at least one full pass so there is a move to make
+        while self.run(job, max(deadline - time.perf_counter(), 0)) and key not in self.analysis:
+            pass
+        if key not in self.analysis:
+            return None
+        scores = self.analysis[key][1]
+        return max(scores, key=lambda col: (scores[col], -abs(col - WIDTH // 2)))
+
+    # reporting
+
+    def evaluations_for(self, position, mask):
+        """{column: (score, depth)} for the player to move, from the analyses of the replies."""
+        evaluations = {}
+        for col in range(WIDTH):
+            if not can_play(mask, col):
+                continue
+            if is_winning_move(position, mask, col):
+                evaluations[col] = (WIN - mask.bit_count() - 1, CELLS)
+                continue
+            child_position, child_mask = play(position, mask, col)
+            if child_mask.bit_count() == CELLS:
+                evaluations[col] = (0, CELLS)
+                continue
+            known = self.analysis.get(child_position + child_mask)
+            if known is not None and known[1]:
+                evaluations[col] = (-max(known[1].values()), known[0] + 1)
+        return evaluations
+
+    def evaluations(self, grid, player):
+        """Per-column evaluation for player in a game grid, whatever has been searched so far."""
+        return self.evaluations_for(*position_from_grid(grid, player))
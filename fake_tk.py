@@ -0,0 +1,701 @@
+#a stand-in for tkinter that needs no display and records what gets drawn
+#
+#Only the parts of tkinter the games and the calculator use are here. Load a
+#program with load_program() and it runs against this module instead of Tk:
+#
+#   FlappyBirdGame = fake_tk.load_program("FLAPPYBIRD.py", "FlappyBirdGame")
+#   root = fake_tk.Tk()
+#   game = root.call(FlappyBirdGame, root)
+#   root.run(frames=100)
+import heapq
+import importlib
+import os
+import sys
+import time
+import types
+from collections import Counter
+
+from script_loader import import_script, module_name
+
+# What "from tkinter import *" picks up
+__all__ = [
+    "Tk", "Toplevel", "Frame", "Label", "Button", "Checkbutton", "Entry", "Text", "Spinbox", "OptionMenu", "Canvas",
+    "PhotoImage", "StringVar", "IntVar", "DoubleVar", "BooleanVar", "TclError", "Event",
+    "END", "INSERT", "NORMAL", "DISABLED", "BOTH", "X", "Y", "LEFT", "RIGHT", "TOP", "BOTTOM",
+    "N", "S", "E", "W", "NSEW",
+]
+
+END = "end"
+INSERT = "insert"
+NORMAL = "normal"
+DISABLED = "disabled"
+BOTH = "both"
+X = "x"
+Y = "y"
+LEFT = "left"
+RIGHT = "right"
+TOP = "top"
+BOTTOM = "bottom"
+N, S, E, W = "n", "s", "e", "w"
+NSEW = "nsew"
+
+# Default size of a canvas that was not given one, like an unmapped window
+DEFAULT_CANVAS_WIDTH = 800
+DEFAULT_CANVAS_HEIGHT = 600
+
+
+class TclError(Exception):
+    pass
+
+
+class Recorder:
+    """Counts canvas and entry operations per frame and follows canvas item lifetimes.
+
+    A frame is one callback run by the fake event loop: an after() tick,
+    a key event or a button press.
+    """
+
+    def __init__(self):
+        self.counts = Counter()  # operation -> total count
+        self.frame_ops = []  # operations in each finished frame
+        self.frame_live = []  # live canvas items at the end of each frame
+        self.frame_seconds = []  # wall time each frame took, Python side only
+        self.started = None
+        self.lifetimes = []  # frames each deleted item was alive for
+        self.created = {}  # (canvas id, item) -> frame it was created in
+        self.current = 0
+        self.peak_live = 0
+        self.largest_text = 0
+
+    @property
+    def frame(self):
+        return len(self.frame_ops)
+
+    @property
+    def live(self):
+        return len(self.created)
+
+    def op(self, kind):
+        self.counts[kind] += 1
+        self.current += 1
+
+    def item_created(self, canvas, item):
+        self.created[(id(canvas), item)] = self.frame
+        self.peak_live = max(self.peak_live, len(self.created))
+
+    def item_deleted(self, canvas, item):
+        self.lifetimes.append(self.frame - self.created.pop((id(canvas), item)))
+
+    def begin_frame(self):
+        self.started = time.perf_counter()
+
+    def end_frame(self):
+        if self.started is not None:
+            self.frame_seconds.append(time.perf_counter() - self.started)
+            self.started = None
+        self.frame_ops.append(self.current)
+        self.frame_live.append(len(self.created))
+        self.current = 0
+
+    def summary(self):
+        frames = self.frame_ops or [0]
+        milliseconds = sorted(seconds * 1000 for seconds in self.frame_seconds) or [0]
+        return {
+            "frames": len(self.frame_ops),
+            "ops": sum(self.counts.values()),
+            "ops_per_frame": sum(frames) / len(frames),
+            "max_ops_per_frame": max(frames),
+            "ms_per_frame": sum(milliseconds) / len(milliseconds),
+            "p99_ms_per_frame": milliseconds[int(len(milliseconds) * 0.99)],
+            "max_ms_per_frame": milliseconds[-1],
+            "live_items": self.live,
+            "peak_live_items": self.peak_live,
+            "mean_item_lifetime": sum(self.lifetimes) / len(self.lifetimes) if self.lifetimes else 0,
+            "largest_text": self.largest_text,
+            "counts": dict(self.counts),
+        }
+
+
+class Event:
+    def __init__(self, widget, **attributes):
+        self.widget = widget
+        self.keysym = ""
+        self.char = ""
+        self.x = self.y = 0
+        self.width = self.height = 0
+        self.__dict__.update(attributes)
+
+
+class Misc:
+    """What every fake widget has: options, children, bindings and the root's event loop."""
+
+    _counter = 0
+
+    def __init__(self, master=None, cnf=None, **options):
+        self.master = master
+        self.children = {}
+        self.options = dict(cnf or {}, **options)
+        self.bindings = {}
+        self.alive = True
+        Misc._counter += 1
+        self._name = f"!{type(self).__name__.lower()}{Misc._counter}"
+        if master is not None:
+            master.children[self._name] = self
+
+    def __str__(self):
+        if self.master is None:
+            return "."
+        parent = str(self.master)
+        return (parent if parent != "." else "") + "." + self._name
+
+    # the tree
+
+    def winfo_toplevel(self):
+        widget = self
+        while not isinstance(widget, (Tk, Toplevel)):
+            widget = widget.master
+        return widget
+
+    def _root(self):
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+
+    def winfo_children(self):
+        return list(self.children.values())
+
+    def winfo_exists(self):
+        return int(self.alive)
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        self.alive = False
+        if self.master is not None:
+            self.master.children.pop(self._name, None)
+
+    # options and geometry
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key, "")
+
+    def __setitem__(self, key, value):
+        self.configure(**{key: value})
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    def winfo_width(self):
+        return int(self.options.get("width", 1))
+
+    def winfo_height(self):
+        return int(self.options.get("height", 1))
+
+    def pack(self, *args, **kwargs):
+        pass
+
+    pack_configure = grid = grid_configure = place = pack
+    pack_forget = grid_forget = grid_remove = pack
+
+    def columnconfigure(self, *args, **kwargs):
+        pass
+
+    rowconfigure = grid_columnconfigure = grid_rowconfigure = columnconfigure
+
+    def focus_set(self):
+        pass
+
+    focus = focus_set
+
+    # events
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def event_generate(self, sequence, **attributes):
+        """Deliver an event to this widget and its window, like Tk's default bindtags."""
+        handlers = [self.bindings.get(sequence)]
+        toplevel = self.winfo_toplevel()
+        if toplevel is not self:
+            handlers.append(toplevel.bindings.get(sequence))
+        for handler in handlers:
+            if handler is not None:
+                self._root().call(handler, Event(self, **attributes))
+
+    # the event loop lives on the root
+
+    def after(self, ms, func=None, *args):
+        return self._root().after(ms, func, *args)
+
+    def after_idle(self, func, *args):
+        return self._root().after(0, func, *args)
+
+    def after_cancel(self, id):
+        self._root().after_cancel(id)
+
+    def update(self):
+        pass
+
+    update_idletasks = update
+
+
+class Tk(Misc):
+    """The fake root window, with a virtual clock and the frame recorder."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.recorder = Recorder()
+        self.now = 0  # virtual milliseconds
+        self._queue = []
+        self._cancelled = set()
+        self._sequence = 0
+        self._depth = 0
+
+    def title(self, string=None):
+        if string is not None:
+            self.options["title"] = string
+        return self.options.get("title", "")
+
+    def geometry(self, string=None):
+        if string is not None:
+            self.options["geometry"] = string
+        return self.options.get("geometry", "")
+
+    def minsize(self, *args):
+        pass
+
+    maxsize = resizable = protocol = minsize
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            self.now += ms
+            return None
+        self._sequence += 1
+        id = f"after#{self._sequence}"
+        heapq.heappush(self._queue, (self.now + ms, self._sequence, id, func, args))
+        return id
+
+    def after_cancel(self, id):
+        self._cancelled.add(id)
+
+    def call(self, func, *args):
+        """Run func as one frame, the way Tk runs a callback."""
+        if not self._depth:
+            self.recorder.begin_frame()
+        self._depth += 1
+        try:
+            return func(*args)
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.recorder.end_frame()
+
+    def step(self):
+        """Run the next scheduled callback; returns False when nothing is left."""
+        while self._queue:
+            due, _, id, func, args = heapq.heappop(self._queue)
+            if id in self._cancelled:
+                self._cancelled.discard(id)
+                continue
+            self.now = max(self.now, due)
+            self.call(func, *args)
+            return True
+        return False
+
+    def run(self, frames=None, ms=None):
+        """Run callbacks until the queue is empty, frames have run or ms of virtual time pass."""
+        stop = None if ms is None else self.now + ms
+        count = 0
+        while self._queue and (frames is None or count < frames):
+            if stop is not None and self._queue[0][0] > stop:
+                self.now = stop
+                break
+            if self.step():
+                count += 1
+        return count
+
+    def mainloop(self, n=0):
+        self.run()
+
+    def destroy(self):
+        super().destroy()
+        self._queue.clear()
+
+
+class Toplevel(Misc):
+    title = Tk.title
+    geometry = Tk.geometry
+    minsize = maxsize = resizable = protocol = Tk.minsize
+
+
+class Frame(Misc):
+    pass
+
+
+class Label(Misc):
+    pass
+
+
+class Button(Misc):
+    def invoke(self):
+        command = self.options.get("command")
+        if command is not None and self.options.get("state") != DISABLED:
+            return self._root().call(command)
+
+
+class Checkbutton(Misc):
+    def invoke(self):
+        if self.options.get("state") == DISABLED:
+            return
+        variable = self.options.get("variable")
+        if variable is not None:
+            variable.set(not variable.get())
+        command = self.options.get("command")
+        if command is not None:
+            return self._root().call(command)
+
+
+class Spinbox(Misc):
+    pass
+
+
+class OptionMenu(Misc):
+    def __init__(self, master, variable, value, *values, **kwargs):
+        super().__init__(master)
+        self.variable = variable
+        self.values = (value,) + values
+
+
+class Entry(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.text = ""
+
+    def _index(self, index):
+        if index == END:
+            return len(self.text)
+        return min(int(index), len(self.text))
+
+    def insert(self, index, string):
+        self._root().recorder.op("entry_insert")
+        if self.options.get("state") == DISABLED:
+            return
+        i = self._index(index)
+        self.text = self.text[:i] + str(string) + self.text[i:]
+        self._root().recorder.largest_text = max(self._root().recorder.largest_text, len(self.text))
+
+    def delete(self, first, last=None):
+        self._root().recorder.op("entry_delete")
+        if self.options.get("state") == DISABLED:
+            return
+        start = self._index(first)
+        stop = start + 1 if last is None else self._index(last)
+        self.text = self.text[:start] + self.text[stop:]
+
+    def get(self):
+        return self.text
+
+
+class Text(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.text = ""
+
+    def insert(self, index, chars, *args):
+        self.text += chars
+
+    def get(self, start, end=None):
+        return self.text + "\n"
+
+    def index(self, index):
+        return f"{self.text.count(chr(10)) + 1}.{len(self.text.rpartition(chr(10))[2])}"
+
+
+class Variable:
+    _default = ""
+
+    def __init__(self, master=None, value=None, name=None):
+        self.value = self._default if value is None else value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class StringVar(Variable):
+    pass
+
+
+class IntVar(Variable):
+    _default = 0
+
+
+class DoubleVar(Variable):
+    _default = 0.0
+
+
+class BooleanVar(Variable):
+    _default = False
+
+
+class PhotoImage:
+    """An image with a size and nothing to draw; pixel data is ignored."""
+
+    def __init__(self, name=None, cnf=None, master=None, width=0, height=0, file=None, data=None, **options):
+        if file is not None and not os.path.exists(file):
+            raise TclError(f'couldn\'t open "{file}": no such file or directory')
+        self._width = int(width) or 1
+        self._height = int(height) or 1
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def put(self, data, to=None):
+        pass
+
+    def copy(self):
+        return PhotoImage(width=self._width, height=self._height)
+
+    def zoom(self, x, y=""):
+        return PhotoImage(width=self._width * x, height=self._height * (y or x))
+
+    def subsample(self, x, y=""):
+        return PhotoImage(width=max(self._width // x, 1), height=max(self._height // (y or x), 1))
+
+
+class _Item:
+    __slots__ = ("id", "type", "coords", "options", "tags")
+
+    def __init__(self, id, type, coords, options, tags):
+        self.id = id
+        self.type = type
+        self.coords = coords
+        self.options = options
+        self.tags = tags
+
+
+def _flatten(args):
+    flat = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            flat.extend(_flatten(arg))
+        else:
+            flat.append(float(arg))
+    return flat
+
+
+def _split_tags(options):
+    tags = options.pop("tags", options.pop("tag", ()))
+    if isinstance(tags, str):
+        tags = tuple(tags.split())
+    return tuple(tags)
+
+
+class Canvas(Misc):
+    """A canvas that keeps its items in a dict and records every operation on them."""
+
+    def __init__(self, master=None, cnf=None, **options):
+        options.setdefault("width", DEFAULT_CANVAS_WIDTH)
+        options.setdefault("height", DEFAULT_CANVAS_HEIGHT)
+        super().__init__(master, cnf, **options)
+        self.items = {}  # id -> _Item, in stacking order
+        self._next_id = 1
+
+    def _find(self, tag_or_id):
+        if isinstance(tag_or_id, int) or (isinstance(tag_or_id, str) and tag_or_id.isdigit()):
+            item = int(tag_or_id)
+            return [item] if item in self.items else []
+        if tag_or_id == "all":
+            return list(self.items)
+        return [item.id for item in self.items.values() if tag_or_id in item.tags]
+
+    def _create(self, type, args, options):
+        self._root().recorder.op("create")
+        item = _Item(self._next_id, type, _flatten(args), {}, _split_tags(options))
+        item.options.update(options)
+        self.items[item.id] = item
+        self._next_id += 1
+        self._root().recorder.item_created(self, item.id)
+        return item.id
+
+    def create_arc(self, *args, **options):
+        return self._create("arc", args, options)
+
+    def create_bitmap(self, *args, **options):
+        return self._create("bitmap", args, options)
+
+    def create_image(self, *args, **options):
+        return self._create("image", args, options)
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    def create_window(self, *args, **options):
+        return self._create("window", args, options)
+
+    def move(self, tag_or_id, dx, dy):
+        self._root().recorder.op("move")
+        for item in self._find(tag_or_id):
+            coords = self.items[item].coords
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def moveto(self, tag_or_id, x="", y=""):
+        self._root().recorder.op("move")
+        for item in self._find(tag_or_id):
+            x1, y1, _, _ = self._bbox(self.items[item])
+            dx = float(x) - x1 if x != "" else 0
+            dy = float(y) - y1 if y != "" else 0
+            coords = self.items[item].coords
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def coords(self, tag_or_id, *args):
+        self._root().recorder.op("coords")
+        found = self._find(tag_or_id)
+        if not found:
+            return []
+        item = self.items[found[0]]
+        if args:
+            item.coords = _flatten(args)
+        return list(item.coords)
+
+    def itemconfigure(self, tag_or_id, cnf=None, **options):
+        self._root().recorder.op("itemconfig")
+        options = dict(cnf or {}, **options)
+        tags = _split_tags(options) if "tags" in options or "tag" in options else None
+        for item in self._find(tag_or_id):
+            self.items[item].options.update(options)
+            if tags is not None:
+                self.items[item].tags = tags
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag_or_id, option):
+        self._root().recorder.op("itemcget")
+        found = self._find(tag_or_id)
+        return self.items[found[0]].options.get(option, "") if found else ""
+
+    def delete(self, *args):
+        self._root().recorder.op("delete")
+        for tag_or_id in args:
+            for item in self._find(tag_or_id):
+                del self.items[item]
+                self._root().recorder.item_deleted(self, item)
+
+    def find_all(self):
+        self._root().recorder.op("find")
+        return tuple(self.items)
+
+    def find_withtag(self, tag_or_id):
+        self._root().recorder.op("find")
+        return tuple(self._find(tag_or_id))
+
+    def _bbox(self, item):
+        xs = item.coords[0::2] or [0]
+        ys = item.coords[1::2] or [0]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def bbox(self, *args):
+        self._root().recorder.op("bbox")
+        boxes = [self._bbox(self.items[item]) for tag in args for item in self._find(tag)]
+        if not boxes:
+            return None
+        return (int(min(b[0] for b in boxes)), int(min(b[1] for b in boxes)),
+                int(max(b[2] for b in boxes)), int(max(b[3] for b in boxes)))
+
+    def find_overlapping(self, x1, y1, x2, y2):
+        self._root().recorder.op("find")
+        return tuple(item.id for item in self.items.values()
+                     if not (self._bbox(item)[2] < x1 or self._bbox(item)[0] > x2
+                             or self._bbox(item)[3] < y1 or self._bbox(item)[1] > y2))
+
+    def gettags(self, tag_or_id):
+        self._root().recorder.op("gettags")
+        found = self._find(tag_or_id)
+        return self.items[found[0]].tags if found else ()
+
+    def type(self, tag_or_id):
+        found = self._find(tag_or_id)
+        return self.items[found[0]].type if found else None
+
+    def tag_raise(self, tag_or_id, above=None):
+        self._root().recorder.op("raise")
+        for item in self._find(tag_or_id):
+            self.items[item] = self.items.pop(item)
+
+    lift = tkraise = tag_raise
+
+    def tag_lower(self, tag_or_id, below=None):
+        self._root().recorder.op("lower")
+        found = self._find(tag_or_id)
+        rest = [item for item in self.items if item not in found]
+        self.items = {item: self.items[item] for item in found + rest}
+
+    def destroy(self):
+        for item in list(self.items):
+            self._root().recorder.item_deleted(self, item)
+        self.items.clear()
+        super().destroy()
+
+
+messagebox = types.ModuleType("tkinter.messagebox")
+for _name in ("showinfo", "showwarning", "showerror"):
+    setattr(messagebox, _name, lambda *args, **kwargs: "ok")
+for _name in ("askyesno", "askokcancel", "askretrycancel"):
+    setattr(messagebox, _name, lambda *args, **kwargs: False)
+
+filedialog = types.ModuleType("tkinter.filedialog")
+filedialog.askopenfilename = filedialog.asksaveasfilename = lambda *args, **kwargs: ""
+
+
+def load_program(filename, class_name):
+    """Import one of the program scripts with this module standing in for tkinter.
+
+    A fresh copy is loaded every time and is not left in sys.modules, so the
+    real programs are unaffected.
+    """
+    # the profiler patches the real tkinter, make sure that is the one it gets
+    importlib.import_module("tk_profiler")
+
+    this = sys.modules[__name__]
+    replaced = {"tkinter": this, "tkinter.messagebox": messagebox, "tkinter.filedialog": filedialog}
+    saved = {name: sys.modules.get(name) for name in replaced}
+    sys.modules.update(replaced)
+    try:
+        module = import_script(filename, "headless_" + module_name(filename), keep=False)
+    finally:
+        for name, module_before in saved.items():
+            if module_before is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module_before
+    return getattr(module, class_name)
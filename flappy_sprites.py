@@ -0,0 +1,133 @@
+#pre-rendered sprites for Flappy Bird
+#
+#Everything is drawn once, pixel by pixel, into RGBA buffers and handed to Tk
+#as PNG data, so the game only ever moves finished images around the canvas.
+#The PNG data is cached per process; the PhotoImages themselves belong to one
+#Tk interpreter, so each game makes its own from it.
+import base64
+import functools
+import math
+import struct
+import zlib
+
+CLEAR = (0, 0, 0, 0)
+
+BIRD_FRAMES = 3  # wing up, level and down
+WING_OFFSETS = (-3, 0, 3)
+CAP_HEIGHT = 20
+CAP_OVERHANG = 3  # pixels the pipe caps stick out on each side
+
+
+class Bitmap:
+    """An RGBA pixel buffer with just enough drawing to build the sprites."""
+
+    def __init__(self, width, height, color=CLEAR):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(_rgba(color)) * (width * height))
+
+    def span(self, y, x0, x1, color):
+        """Fill pixels x0..x1 (inclusive) of row y, wrapping around the sides."""
+        if not 0 <= y < self.height or x1 < x0:
+            return
+        pixel = bytes(_rgba(color))
+        for x in range(x0, x1 + 1):
+            i = (y * self.width + x % self.width) * 4
+            self.pixels[i:i + 4] = pixel
+
+    def rectangle(self, x0, y0, x1, y1, color):
+        for y in range(y0, y1 + 1):
+            self.span(y, x0, x1, color)
+
+    def ellipse(self, cx, cy, rx, ry, color):
+        for y in range(math.floor(cy - ry), math.ceil(cy + ry) + 1):
+            dy = (y - cy) / ry
+            if abs(dy) <= 1:
+                half = rx * math.sqrt(1 - dy * dy)
+                self.span(y, math.ceil(cx - half), math.floor(cx + half), color)
+
+    def png(self):
+        """The buffer as base64 PNG data, which PhotoImage(data=...) reads."""
+        stride = self.width * 4
+        raw = b"".join(b"\x00" + self.pixels[y * stride:(y + 1) * stride] for y in range(self.height))
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0)
+        data = b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header) + _chunk(b"IDAT", zlib.compress(raw)) + _chunk(b"IEND", b"")
+        return base64.b64encode(data).decode("ascii")
+
+
+def _rgba(color):
+    return color if len(color) == 4 else (*color, 255)
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _shade(color, factor):
+    return tuple(min(255, round(channel * factor)) for channel in color[:3])
+
+
+@functools.lru_cache(maxsize=None)
+def bird(frame, size):
+    """One frame of the bird flapping, size pixels square like its hitbox."""
+    sprite = Bitmap(size, size)
+    c = (size - 1) / 2
+    sprite.ellipse(c, c, size / 2, size / 2 - 1, (190, 120, 20))
+    sprite.ellipse(c, c, size / 2 - 1.5, size / 2 - 2.5, (250, 215, 40))
+    sprite.ellipse(c - size / 5, c + WING_OFFSETS[frame] * size / 20, size / 4, size / 8, (255, 245, 200))
+    sprite.ellipse(c + size / 5, c - size / 6, size / 7, size / 7, (255, 255, 255))
+    sprite.ellipse(c + size / 4, c - size / 6, size / 20, size / 20, (0, 0, 0))
+    sprite.rectangle(round(c + size / 3), round(c), size - 1, round(c + size / 8), (235, 90, 30))
+    return sprite.png()
+
+
+def _pipe_row(width, color):
+    # lit from the left: bright band, then darker towards the right edge
+    sprite = Bitmap(width, 1, color)
+    for x in range(width):
+        position = x / max(width - 1, 1)
+        sprite.span(0, x, x, _shade(color, 1.35 - 0.6 * position if position > 0.2 else 1.2))
+    sprite.span(0, 0, 0, _shade(color, 0.5))
+    sprite.span(0, width - 1, width - 1, _shade(color, 0.5))
+    return sprite.pixels
+
+
+@functools.lru_cache(maxsize=None)
+def pipe_body(width, height, color=(60, 170, 60)):
+    sprite = Bitmap(width, height)
+    sprite.pixels[:] = _pipe_row(width, color) * height
+    return sprite.png()
+
+
+@functools.lru_cache(maxsize=None)
+def pipe_cap(width, height=CAP_HEIGHT, color=(80, 195, 80)):
+    sprite = Bitmap(width, height)
+    sprite.pixels[:] = _pipe_row(width, color) * height
+    sprite.rectangle(0, 0, width - 1, 0, _shade(color, 0.5))
+    sprite.rectangle(0, height - 1, width - 1, height - 1, _shade(color, 0.5))
+    return sprite.png()
+
+
+@functools.lru_cache(maxsize=None)
+def clouds(width, height):
+    """A strip of clouds that tiles seamlessly from side to side."""
+    sprite = Bitmap(width, height)
+    for i in range(4):
+        x = width * i // 4 + (37 * i) % 50
+        y = height // 3 + (23 * i) % (height // 3)
+        for dx, dy, r in ((-18, 4, 14), (0, -4, 20), (20, 4, 15)):
+            sprite.ellipse(x + dx, y + dy, r * 1.3, r, (255, 255, 255, 235))
+    return sprite.png()
+
+
+@functools.lru_cache(maxsize=None)
+def hills(width, height, color=(95, 160, 90)):
+    """Rolling hills along the bottom, tiling seamlessly from side to side."""
+    sprite = Bitmap(width, height)
+    for x in range(width):
+        angle = 2 * math.pi * x / width
+        top = round(height * (0.45 + 0.2 * math.sin(2 * angle) + 0.1 * math.sin(5 * angle + 1)))
+        sprite.rectangle(x, top, x, top + 2, _shade(color, 1.2))
+        sprite.rectangle(x, top + 3, x, height - 1, color)
+    return sprite.png()
+
@@ -2,6 +2,8 @@ import tkinter as tk
 import random
 import time
 
+import tk_profiler
+
 # Maze configuration defaults
 DEFAULT_CELL_SIZE = 25
 
@@ -12,6 +14,13 @@ MAZE_SIZES = {
     "hard": (45, 45)
 }
 
+# Seconds on the clock for each level
+DIFFICULTIES = {
+    "easy": 90,
+    "medium": 120,
+    "hard": 150
+}
+
 # Key Bindings
 KEY_BINDINGS = """
 W - Move Up
@@ -84,8 +93,10 @@ def create_solvable_maze(rows, cols):
     return maze, exit_pos
 
 class MazeGame:
-    def __init__(self, root, rows, cols, timer_duration, exit_pos):
+    def __init__(self, root, rows, cols, timer_duration, exit_pos, maze=None, menu=None):
         self.root = root
+        self.window = root.winfo_toplevel()
+        self.menu = menu
         self.rows = rows
         self.cols = cols
         self.cell_size = DEFAULT_CELL_SIZE  # Fixed cell size
@@ -94,7 +105,7 @@ class MazeGame:
         self.canvas = tk.Canvas(root, width=self.cols * self.cell_size, height=self.rows * self.cell_size, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=False)  # Fixed canvas size
 
-        self.maze = create_solvable_maze(self.rows, self.cols)[0]
+        self.maze = maze if maze is not None else create_solvable_maze(self.rows, self.cols)[0]
         self.exit_pos = exit_pos
         self.player_pos = [1, 1]  # Starting position of the player
         self.game_over = False
@@ -106,11 +117,13 @@ class MazeGame:
             print(f"Error loading image: {e}")
             self.player_image = None
         self.player_sprite = None  # store the player sprite here
+        self.timer_id = None
+        self.win_popup = None
 
         self.draw_maze()
         self.draw_player()
 
-        self.root.bind("<KeyPress>", self.handle_keypress)
+        self.window.bind("<KeyPress>", self.handle_keypress)
 
         self.timer_label = tk.Label(root, text=f"Time Left: {self.time_left}s", font=("Helvetica", 16), fg="black", bg="yellow")
         self.timer_label.pack(pady=5, side="top", fill="x")
@@ -178,7 +191,7 @@ class MazeGame:
         if self.time_left > 0:
             self.time_left -= 1
             self.update_timer()
-            self.root.after(1000, self.countdown_timer)
+            self.timer_id = self.root.after(1000, self.countdown_timer)
         else:
             self.show_game_over()
 
@@ -199,7 +212,7 @@ class MazeGame:
 
     def show_win_popup(self):
         """Display a popup with win animation and replay options."""
-        win_popup = tk.Toplevel(self.root)
+        win_popup = self.win_popup = tk.Toplevel(self.root)
         win_popup.title("You Win!")
         win_popup.geometry("300x200")
         
@@ -218,59 +231,79 @@ class MazeGame:
 
     def restart_game(self):
         """Restart the game with the same difficulty."""
-        self.root.destroy()  # Close the current window
-        show_menu() 
+        self.menu.start_game(self.rows, self.cols, self.timer_duration)
 
     def change_difficulty(self, win_popup):
         """Allow the player to change difficulty."""
-        win_popup.destroy()  # Close the win popup
-        show_menu() 
-
-def show_menu():
-    """Display the main menu with difficulty selection."""
-    menu_window = tk.Tk()
-    menu_window.title("Maze Game")
-
-    title_label = tk.Label(menu_window, text="Maze Game", font=("Helvetica", 24))
-    title_label.pack(pady=20)
-
-    instructions_label = tk.Label(menu_window, text=KEY_BINDINGS, font=("Helvetica", 12))
-    instructions_label.pack(padx=10)
-
-    # Button to start the game
-    start_button = tk.Button(menu_window, text="Start Game", font=("Helvetica", 14),
-                             command=lambda: show_difficulty_menu(menu_window))
-    start_button.pack(pady=20)
-
-    menu_window.mainloop()
-
-def show_difficulty_menu(menu_window):
-    """Show the difficulty menu to choose difficulty."""
-    for widget in menu_window.winfo_children():
-        widget.destroy()
-
-    label = tk.Label(menu_window, text="Select Difficulty", font=("Helvetica", 20))
-    label.pack(pady=10)
-
-    easy_button = tk.Button(menu_window, text="Easy", width=20, command=lambda: start_game(menu_window, "easy", 90))
-    easy_button.pack(pady=10)
-
-    medium_button = tk.Button(menu_window, text="Medium", width=20, command=lambda: start_game(menu_window, "medium", 120))
-    medium_button.pack(pady=10)
-
-    hard_button = tk.Button(menu_window, text="Hard", width=20, command=lambda: start_game(menu_window, "hard", 150))
-    hard_button.pack(pady=10)
-
-def start_game(menu_window, difficulty, timer_duration):
-    """Start the game with selected difficulty."""
-    menu_window.destroy()  # Close the menu window
-
-    # Load maze configuration
-    rows, cols = MAZE_SIZES[difficulty]
-    maze, exit_pos = create_solvable_maze(rows, cols)  # Generate the maze and get exit position
+        self.menu.show_difficulty_menu()
 
+    def close(self):
+        """Cancel the countdown, close the win popup and let go of the arrow keys."""
+        self.game_over = True
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+        if self.win_popup is not None and self.win_popup.winfo_exists():
+            self.win_popup.destroy()
+        self.window.unbind("<KeyPress>")
+
+class MazeMenu:
+    """Menus around MazeGame, all shown inside the same window."""
+    def __init__(self, root):
+        self.root = root
+        self.window = root.winfo_toplevel()
+        self.window.title("Maze Game")
+        self.game = None
+        self.show_menu()
+
+    def clear(self):
+        """Take the current screen down, stopping the game if one is running."""
+        self.close()
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+    def close(self):
+        if self.game is not None:
+            self.game.close()
+            self.game = None
+
+    def show_menu(self):
+        """Display the main menu with difficulty selection."""
+        self.clear()
+
+        title_label = tk.Label(self.root, text="Maze Game", font=("Helvetica", 24))
+        title_label.pack(pady=20)
+
+        instructions_label = tk.Label(self.root, text=KEY_BINDINGS, font=("Helvetica", 12))
+        instructions_label.pack(padx=10)
+
+        # Button to start the game
+        start_button = tk.Button(self.root, text="Start Game", font=("Helvetica", 14),
+                                 command=self.show_difficulty_menu)
+        start_button.pack(pady=20)
+
+    def show_difficulty_menu(self):
+        """Show the difficulty menu to choose difficulty."""
+        self.clear()
+
+        label = tk.Label(self.root, text="Select Difficulty", font=("Helvetica", 20))
+        label.pack(pady=10)
+
+        for difficulty, timer_duration in DIFFICULTIES.items():
+            rows, cols = MAZE_SIZES[difficulty]
+            button = tk.Button(self.root, text=difficulty.title(), width=20,
+                               command=lambda r=rows, c=cols, t=timer_duration: self.start_game(r, c, t))
+            button.pack(pady=10)
+
+    def start_game(self, rows, cols, timer_duration):
+        """Start the game with selected difficulty."""
+        self.clear()
+
+        maze, exit_pos = create_solvable_maze(rows, cols)  # Generate the maze and get exit position
+        self.game = MazeGame(self.root, rows, cols, timer_duration, exit_pos, maze=maze, menu=self)
+
+if __name__ == "__main__":
+    tk_profiler.enable_from_command_line()
     root = tk.Tk()
-    game = MazeGame(root, rows, cols, timer_duration, exit_pos)
+    MazeMenu(root)
     root.mainloop()
-
-show_menu()
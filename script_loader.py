@@ -0,0 +1,34 @@
+#imports the program scripts by path, since some of their names have spaces
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def module_name(filename):
+    """The module name a script is imported under: "CONNECT 4.py" -> "connect_4"."""
+    return os.path.splitext(filename)[0].lower().replace(" ", "_")
+
+
+def import_script(filename, name=None, keep=True):
+    """Import a script from this folder and return the module.
+
+    With keep the module goes into sys.modules under name and is reused
+    next time; without it a fresh copy is loaded and nothing is left behind.
+    """
+    name = name or module_name(filename)
+    if keep and name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    if not keep:
+        spec.loader.exec_module(module)
+        return module
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
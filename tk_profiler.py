@@ -0,0 +1,258 @@
+#opt-in profiler counting the Tcl round-trips the games make, per method and per frame
+#
+#   TK_PROFILE=profile.json python FLAPPYBIRD.py
+#   python LAUNCHER.py --profile=profile.folded
+#
+#A ".folded" output is in the collapsed-stack format flamegraph.pl and speedscope read,
+#anything else is written as JSON.
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tkinter as tk
+
+ENV_VAR = "TK_PROFILE"
+FLAG = "--profile"
+DEFAULT_OUTPUT = "tk_profile.json"
+
+# A frame's callback and the redraw it causes should fit in one 50 fps tick
+FRAME_BUDGET_MS = 20
+
+# Widget methods that talk to Tcl, per class
+METHODS = {
+    tk.Canvas: (
+        "create_arc", "create_bitmap", "create_image", "create_line", "create_oval", "create_polygon",
+        "create_rectangle", "create_text", "create_window", "move", "moveto", "coords", "itemconfigure",
+        "itemconfig", "itemcget", "delete", "find", "find_all", "find_withtag", "find_overlapping", "bbox",
+        "tag_raise", "tag_lower", "lift", "lower", "gettags", "addtag", "dtag", "type",
+    ),
+    tk.Entry: ("insert", "delete", "get"),
+    tk.Misc: (
+        "after", "after_idle", "after_cancel", "update", "update_idletasks", "configure", "config", "cget",
+        "bind", "unbind", "winfo_width", "winfo_height", "winfo_children", "winfo_exists",
+    ),
+    tk.BaseWidget: ("destroy",),
+    tk.Pack: ("pack_configure", "pack"),
+    tk.Grid: ("grid_configure", "grid"),
+}
+
+OUTSIDE = "(outside callbacks)"
+
+profiler = None
+_installed = False
+
+
+class Profiler:
+    """Collects call counts and times, grouped per method and per frame.
+
+    A frame is one callback from the Tk event loop - an after() tick, a key
+    binding, a button command - named after the Python function it runs.
+    Calls a wrapped method makes to other wrapped methods are not counted
+    separately, so aliases and helpers are only counted once.
+
+    Tk only redraws once the callback has returned, so a frame's own time
+    would leave out the drawing it caused. Each frame therefore ends by
+    flushing the redraw with update_idletasks(), timed on its own as the
+    frame's draw time.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.methods = {}  # "Canvas.move" -> [calls, seconds]
+        self.frames = {}  # frame name -> aggregate for frames of that name
+        self.stacks = {}  # (frame name, method) -> seconds, for the flame graph
+        self.items = {}  # canvas path -> live item count
+        self.peak_items = 0
+        self.frame_name = None
+        self.frame_calls = 0
+        self.frame_seconds = 0.0
+        self.draw_seconds = 0.0
+        self.depth = 0
+        self.inside = False
+
+    def record(self, label, seconds):
+        stats = self.methods.setdefault(label, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        key = (self.frame_name or OUTSIDE, label)
+        self.stacks[key] = self.stacks.get(key, 0.0) + seconds
+        if self.depth:
+            self.frame_calls += 1
+            self.frame_seconds += seconds
+
+    def begin_frame(self, name):
+        self.depth += 1
+        if self.depth == 1:
+            self.frame_name = name
+            self.frame_calls = 0
+            self.frame_seconds = 0.0
+            self.draw_seconds = 0.0
+            self.frame_started = time.perf_counter()
+
+    def end_frame(self):
+        self.depth -= 1
+        if self.depth:
+            return
+        elapsed = time.perf_counter() - self.frame_started
+        stats = self.frames.setdefault(self.frame_name, {
+            "frames": 0, "calls": 0, "max_calls": 0, "seconds": 0.0, "max_seconds": 0.0, "tcl_seconds": 0.0,
+            "draw_seconds": 0.0, "max_draw_seconds": 0.0, "over_budget": 0, "max_live_items": 0,
+        })
+        live_items = sum(self.items.values())
+        stats["frames"] += 1
+        stats["calls"] += self.frame_calls
+        stats["max_calls"] = max(stats["max_calls"], self.frame_calls)
+        stats["seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+        stats["tcl_seconds"] += self.frame_seconds
+        stats["draw_seconds"] += self.draw_seconds
+        stats["max_draw_seconds"] = max(stats["max_draw_seconds"], self.draw_seconds)
+        if elapsed * 1000 > FRAME_BUDGET_MS:
+            stats["over_budget"] += 1
+        stats["max_live_items"] = max(stats["max_live_items"], live_items)
+        self.frame_name = None
+
+    def count_items(self, canvas, change):
+        path = str(canvas)
+        self.items[path] = max(self.items.get(path, 0) + change, 0)
+        self.peak_items = max(self.peak_items, sum(self.items.values()))
+
+    def report(self):
+        frames = {}
+        for name, stats in self.frames.items():
+            frames[name] = dict(stats, calls_per_frame=stats["calls"] / stats["frames"],
+                                ms_per_frame=stats["seconds"] * 1000 / stats["frames"],
+                                draw_ms_per_frame=stats["draw_seconds"] * 1000 / stats["frames"])
+        return {
+            "methods": {label: {"calls": calls, "seconds": seconds}
+                        for label, (calls, seconds) in sorted(self.methods.items(), key=lambda item: -item[1][1])},
+            "frame_budget_ms": FRAME_BUDGET_MS,
+            "frames": frames,
+            "canvas_items": {"live": sum(self.items.values()), "peak": self.peak_items},
+        }
+
+    def dump(self):
+        with open(self.output, "w") as f:
+            if self.output.endswith(".folded"):
+                for (frame, label), seconds in sorted(self.stacks.items()):
+                    f.write(f"{frame};{label} {round(seconds * 1e6)}\n")
+            else:
+                json.dump(self.report(), f, indent=2)
+        print(f"Tk profile written to {self.output}", file=sys.stderr)
+
+
+def _callback_name(func):
+    # after() hands Tcl its own callit() closure, the real callback is inside it.
+    # callit() is renamed after the callback, so look at its code object instead.
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and "func" in code.co_freevars:
+        func = func.__closure__[code.co_freevars.index("func")].cell_contents
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+def _wrap(cls, name):
+    original = cls.__dict__[name]
+    label = f"{cls.__name__}.{name}"
+    creates = name.startswith("create_")
+    deletes = cls is tk.Canvas and name == "delete"
+    destroys = name == "destroy"
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        if profiler is None or profiler.inside:
+            return original(self, *args, **kwargs)
+        if deletes:
+            # count what is about to go, outside the timed call
+            doomed = set()
+            for tag in args:
+                doomed.update(self.tk.splitlist(self.tk.call(self._w, "find", "withtag", tag)))
+            profiler.count_items(self, -len(doomed))
+        profiler.inside = True
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            profiler.record(label, time.perf_counter() - started)
+            profiler.inside = False
+            if creates:
+                profiler.count_items(self, 1)
+            elif destroys:
+                # children are destroyed inside this call, where nothing is counted
+                path = str(self)
+                prefix = path.rstrip(".") + "."  # the root's path is "." itself
+                for canvas in [canvas for canvas in profiler.items
+                               if canvas == path or canvas.startswith(prefix)]:
+                    del profiler.items[canvas]
+
+    setattr(cls, name, wrapper)
+
+
+def _draw(widget):
+    # flush the redraw the frame caused so it is timed as part of the frame
+    profiler.inside = True
+    started = time.perf_counter()
+    try:
+        widget.update_idletasks()
+    except tk.TclError:
+        pass  # the callback destroyed its own window
+    finally:
+        profiler.draw_seconds += time.perf_counter() - started
+        profiler.inside = False
+
+
+def _wrap_callbacks():
+    original = tk.CallWrapper.__call__
+
+    @functools.wraps(original)
+    def call(self, *args):
+        if profiler is None:
+            return original(self, *args)
+        # a callback run from inside update() is part of the frame that called update()
+        inside, profiler.inside = profiler.inside, False
+        profiler.begin_frame(_callback_name(self.func))
+        try:
+            return original(self, *args)
+        finally:
+            if profiler.depth == 1:
+                _draw(self.widget)
+            profiler.end_frame()
+            profiler.inside = inside
+
+    tk.CallWrapper.__call__ = call
+
+
+def enable(output=DEFAULT_OUTPUT):
+    """Start profiling every Tk call and write the report to output on exit."""
+    global profiler, _installed
+    if profiler is not None:
+        return profiler
+    profiler = Profiler(output)
+    if not _installed:
+        for cls, names in METHODS.items():
+            for name in names:
+                _wrap(cls, name)
+        _wrap_callbacks()
+        _installed = True
+    atexit.register(profiler.dump)
+    return profiler
+
+
+def enable_from_command_line(argv=None):
+    """Turn profiling on if TK_PROFILE is set or --profile[=PATH] was passed.
+
+    The flag is removed from argv so the program's own argument handling
+    never sees it.
+    """
+    argv = sys.argv if argv is None else argv
+    output = os.environ.get(ENV_VAR) or None
+    if output == "1":
+        output = DEFAULT_OUTPUT
+    for arg in list(argv[1:]):
+        if arg == FLAG or arg.startswith(FLAG + "="):
+            argv.remove(arg)
+            output = arg.partition("=")[2] or DEFAULT_OUTPUT
+    if output:
+        return enable(output)
+    return None